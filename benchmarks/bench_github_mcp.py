@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Latency/throughput benchmark for GitHubMCPClient against the local fake server.
+
+Three access patterns are measured:
+    serial     one session, one call at a time
+    pooled     --pool-size sessions, --concurrency calls in flight
+    paginated  walks list_issues page by page until the last page
+
+For each pattern the p50/p95/p99 call latency and the calls per second are
+reported. The rate-limit scheduler is configured without effective limits so
+the numbers reflect the client and transport, not the admission control.
+
+Usage (from the repository root):
+    python benchmarks/bench_github_mcp.py --calls 200 --latency 20 --jitter 10
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mcp import StdioServerParameters
+from github_mcp_fixed import GitHubMCPClient
+from github_mcp_scheduler import RateLimitScheduler
+
+FAKE_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_github_mcp_server.py")
+
+UNLIMITED = {"core": (1e9, 1e9), "search": (1e9, 1e9), "tool": (1e9, 1e9), "tools": {"search_code": (1e9, 1e9)}}
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+def summarize(name, latencies, elapsed, errors):
+    return {
+        "pattern": name,
+        "calls": len(latencies),
+        "errors": errors,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "calls_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+def workload(calls):
+    """Mixed read workload cycling through the tools the client uses"""
+    ops = [
+        ("search_repositories", {"query": "language:python"}),
+        ("search_code", {"query": "useState", "owner": "owner-1", "repo": "repo-1"}),
+        ("list_issues", {"owner": "owner-1", "repo": "repo-1"}),
+        ("list_pull_requests", {"owner": "owner-1", "repo": "repo-1"}),
+        ("get_file_contents", {"owner": "owner-1", "repo": "repo-1", "path": "src/App.jsx"}),
+        ("get_user", {"username": "octocat"}),
+    ]
+    return [ops[i % len(ops)] for i in range(calls)]
+
+
+async def timed_call(client, op, kwargs, latencies):
+    start = time.perf_counter()
+    try:
+        result = await getattr(client, op)(**kwargs)
+        return 1 if getattr(result, "isError", False) else 0
+    except Exception:
+        return 1
+    finally:
+        latencies.append(time.perf_counter() - start)
+
+
+async def make_client(args, pool_size):
+    server_args = [FAKE_SERVER, "--latency", str(args.latency), "--jitter", str(args.jitter),
+                   "--error-rate", str(args.error_rate), "--issues", str(args.issues)]
+    client = GitHubMCPClient(
+        timeout=30.0,
+        scheduler=RateLimitScheduler(limits=UNLIMITED, max_in_flight=10_000),
+        server_params=StdioServerParameters(command=sys.executable, args=server_args),
+        pool_size=pool_size
+    )
+    if not await client.connect():
+        raise RuntimeError("Could not start the fake GitHub MCP server")
+    return client
+
+
+async def bench_serial(args):
+    client = await make_client(args, 1)
+    try:
+        latencies, errors = [], 0
+        start = time.perf_counter()
+        for op, kwargs in workload(args.calls):
+            errors += await timed_call(client, op, kwargs, latencies)
+        return summarize("serial", latencies, time.perf_counter() - start, errors)
+    finally:
+        await client.close()
+
+
+async def bench_pooled(args):
+    client = await make_client(args, args.pool_size)
+    try:
+        latencies = []
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def run(op, kwargs):
+            async with semaphore:
+                return await timed_call(client, op, kwargs, latencies)
+
+        start = time.perf_counter()
+        errors = sum(await asyncio.gather(*(run(op, kwargs) for op, kwargs in workload(args.calls))))
+        return summarize(f"pooled x{args.pool_size}", latencies, time.perf_counter() - start, errors)
+    finally:
+        await client.close()
+
+
+async def bench_paginated(args):
+    client = await make_client(args, 1)
+    try:
+        latencies, errors = [], 0
+        start = time.perf_counter()
+        page = 1
+        while True:
+            call_start = time.perf_counter()
+            result = await client.list_issues("owner-1", "repo-1", per_page=args.per_page, page=page)
+            latencies.append(time.perf_counter() - call_start)
+            if result.isError:
+                errors += 1
+                break
+            items = json.loads(result.content[0].text)
+            if len(items) < args.per_page:
+                break
+            page += 1
+        return summarize("paginated", latencies, time.perf_counter() - start, errors)
+    finally:
+        await client.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark GitHubMCPClient against a local fake server")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per serial/pooled run")
+    parser.add_argument("--latency", type=float, default=20.0, help="Injected server latency in milliseconds")
+    parser.add_argument("--jitter", type=float, default=10.0, help="Injected latency jitter in milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls failing on the server")
+    parser.add_argument("--pool-size", type=int, default=4, help="Sessions in the pooled run")
+    parser.add_argument("--concurrency", type=int, default=16, help="Calls in flight in the pooled run")
+    parser.add_argument("--issues", type=int, default=1000, help="Issues walked in the paginated run")
+    parser.add_argument("--per-page", type=int, default=100, help="Page size in the paginated run")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = [await bench_serial(args), await bench_pooled(args), await bench_paginated(args)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'pattern':<14}{'calls':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'calls/s':>10}")
+    for r in results:
+        print(f"{r['pattern']:<14}{r['calls']:>7}{r['errors']:>8}{r['p50_ms']:>10.1f}"
+              f"{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['calls_per_sec']:>10.1f}")
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(main())
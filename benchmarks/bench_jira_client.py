@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Per-topic overhead of Jira searches: a new JIRA client per call (the previous
+get_jira_issues behavior), the shared keep-alive client, and the shared client
+searching the topics concurrently.
+
+Runs against benchmarks/fake_jira_server.py in-process, with an injected
+connection setup cost standing in for the TLS handshake.
+
+Usage (from the repository root):
+    python benchmarks/bench_jira_client.py --topics 20 --latency 30 --handshake 60
+
+With --rate-limit the fake server answers 429 above that many requests per
+second, which exercises the Retry-After handling of the concurrent run.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fake_jira_server import WORDS, start_server
+
+
+def fresh_client_search(server_url, topic):
+    """The previous get_jira_issues: one client, session and server-info round trip per call"""
+    from jira import JIRA
+    jira = JIRA(server=server_url, basic_auth=("bench@example.com", "token"))
+    issues = jira.search_issues(f'text ~ "{topic}" ORDER BY created DESC')
+    jira.close()
+    return {i.key: i.fields.summary for i in issues}
+
+
+def run(name, search_all, topics, jira):
+    before = dict(jira.stats)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        search_all(topics)
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": name,
+        "per_topic_ms": elapsed / len(topics) * 1000,
+        "total_ms": elapsed * 1000,
+        "connections": jira.stats["connections"] - before["connections"],
+        "requests": jira.stats["requests"] - before["requests"],
+        "throttled": jira.stats["throttled"] - before["throttled"],
+    }
+
+
+def serially(search):
+    return lambda topics: [search(topic) for topic in topics]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shared vs per-call Jira clients")
+    parser.add_argument("--topics", type=int, default=20, help="Number of topic searches")
+    parser.add_argument("--latency", type=float, default=30.0, help="Per-request latency in milliseconds")
+    parser.add_argument("--handshake", type=float, default=60.0, help="New connection latency in milliseconds")
+    parser.add_argument("--workers", type=int, default=8, help="Threads in the concurrent run")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Server requests per second before 429 (0 = unlimited)")
+    args = parser.parse_args()
+
+    server, jira = start_server(latency=args.latency / 1000, handshake=args.handshake / 1000,
+                                rate_limit=args.rate_limit)
+    server_url = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ.update({"JIRA_SERVER": server_url, "JIRA_EMAIL": "bench@example.com", "JIRA_API_TOKEN": "token"})
+
+    from jira_extractor.user_functions import get_jira_issues, get_jira_issues_concurrent
+
+    topics = [WORDS[i % len(WORDS)] for i in range(args.topics)]
+    results = [
+        run("client per call", serially(lambda t: fresh_client_search(server_url, t)), topics, jira),
+        run("shared client", serially(lambda t: get_jira_issues({"topic": t})), topics, jira),
+        run(f"concurrent x{args.workers}", lambda t: get_jira_issues_concurrent(t, args.workers), topics, jira),
+    ]
+    server.shutdown()
+
+    print(f"{'mode':<18}{'per topic ms':>14}{'total ms':>12}{'connections':>13}{'requests':>10}{'throttled':>11}")
+    for r in results:
+        print(f"{r['mode']:<18}{r['per_topic_ms']:>14.1f}{r['total_ms']:>12.1f}{r['connections']:>13}"
+              f"{r['requests']:>10}{r['throttled']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GitHub MCP server.
+
+Implements, over stdio, the tools GitHubMCPClient calls (search_repositories,
+search_code, list_issues, list_pull_requests, get_file_contents, get_user)
+with deterministic synthetic data, so the client can be exercised and
+benchmarked without Docker or a GitHub token.
+
+Latency and failures are injected per call:
+    --latency / --jitter     mean and spread of the simulated response time (ms)
+    --tail-rate / --tail-latency
+                             fraction of calls that are slow, and their extra latency (ms)
+    --error-rate             fraction of calls failing with a server error
+    --rate-limit-rate        fraction of calls failing with a GitHub rate-limit error
+
+Run it through GitHubMCPClient with:
+    StdioServerParameters(command=sys.executable,
+                          args=["benchmarks/fake_github_mcp_server.py", "--latency", "50"])
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("fake-github", log_level="WARNING")
+
+CONFIG = {
+    "latency": 0.0,          # Mean injected latency in seconds
+    "jitter": 0.0,           # Uniform jitter around the mean in seconds
+    "tail_rate": 0.0,        # Fraction of calls getting the tail latency on top
+    "tail_latency": 0.0,     # Extra latency of slow calls in seconds
+    "error_rate": 0.0,       # Fraction of calls failing with a generic error
+    "rate_limit_rate": 0.0,  # Fraction of calls failing with a rate-limit error
+    "repos": 1000,           # Total repositories returned by search
+    "issues": 250,           # Issues (and pull requests) per repository
+}
+
+_random = random.Random(0)
+
+# Synthetic repository tree: directory -> list of (name, is_dir)
+TREE = {
+    "": [("README.md", False), ("package.json", False), ("Dockerfile", False),
+         (".gitignore", False), ("src", True), ("tests", True), ("docs", True)],
+    "src": [("index.js", False), ("App.jsx", False), ("components", True),
+            ("services", True), ("styles", True)],
+    "src/components": [(f"Component{i}.jsx", False) for i in range(12)],
+    "src/services": [("api.js", False), ("auth.js", False), ("db.js", False)],
+    "src/styles": [("main.css", False), ("theme.css", False)],
+    "tests": [(f"test_{i}.js", False) for i in range(8)],
+    "docs": [("setup.md", False), ("architecture.md", False)],
+}
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha1("/".join(map(str, parts)).encode()).hexdigest()
+
+
+async def _simulate(tool: str):
+    """Apply the configured latency and failure injection"""
+    delay = CONFIG["latency"]
+    if CONFIG["jitter"]:
+        delay += _random.uniform(-CONFIG["jitter"], CONFIG["jitter"])
+    if CONFIG["tail_rate"] and _random.random() < CONFIG["tail_rate"]:
+        delay += CONFIG["tail_latency"]
+    if delay > 0:
+        await asyncio.sleep(delay)
+    roll = _random.random()
+    if roll < CONFIG["rate_limit_rate"]:
+        raise RuntimeError("403 API rate limit exceeded, retry after 1 seconds")
+    if roll < CONFIG["rate_limit_rate"] + CONFIG["error_rate"]:
+        raise RuntimeError(f"502 Bad Gateway while calling {tool}")
+
+
+def _page(total: int, page: int, per_page: int) -> range:
+    start = (max(1, page) - 1) * per_page
+    return range(start, min(total, start + per_page))
+
+
+def _file_content(owner: str, repo: str, path: str) -> str:
+    # Deterministic, roughly size-varying content per path
+    lines = 5 + int(_digest(owner, repo, path)[:2], 16) % 60
+    return "".join(f"// {path} line {i}\n" for i in range(lines))
+
+
+@mcp.tool(structured_output=False)
+async def search_repositories(query: str, sort: str = "stars", order: str = "desc",
+                              per_page: int = 30, page: int = 1) -> str:
+    await _simulate("search_repositories")
+    items = [{
+        "id": i,
+        "name": f"repo-{i}",
+        "full_name": f"owner-{i % 50}/repo-{i}",
+        "owner": {"login": f"owner-{i % 50}"},
+        "html_url": f"https://github.com/owner-{i % 50}/repo-{i}",
+        "description": f"Synthetic repository {i} matching '{query}'",
+        "stargazers_count": CONFIG["repos"] - i,
+        "language": ("Python", "JavaScript", "Go")[i % 3],
+    } for i in _page(CONFIG["repos"], page, per_page)]
+    return json.dumps({"total_count": CONFIG["repos"], "incomplete_results": False, "items": items})
+
+
+@mcp.tool(structured_output=False)
+async def search_code(query: str, per_page: int = 30, page: int = 1, filename: str = None,
+                      extension: str = None, repo: str = None) -> str:
+    await _simulate("search_code")
+    full_name = repo or "owner-0/repo-0"
+    paths = [f"{d}/{name}".lstrip("/") for d, entries in TREE.items() for name, is_dir in entries if not is_dir]
+    if extension:
+        paths = [p for p in paths if p.endswith(f".{extension.lstrip('.')}")]
+    if filename:
+        paths = [p for p in paths if p.rsplit("/", 1)[-1] == filename]
+    items = [{
+        "name": paths[i].rsplit("/", 1)[-1],
+        "path": paths[i],
+        "sha": _digest(full_name, paths[i]),
+        "url": f"https://api.github.com/repos/{full_name}/contents/{paths[i]}",
+        "html_url": f"https://github.com/{full_name}/blob/main/{paths[i]}",
+        "repository": {"full_name": full_name},
+    } for i in _page(len(paths), page, per_page)]
+    return json.dumps({"total_count": len(paths), "incomplete_results": False, "items": items})
+
+
+def _issues(owner, repo, state, per_page, page, pulls=False):
+    kind = "pulls" if pulls else "issues"
+    return [{
+        "number": n + 1,
+        "title": f"Synthetic {kind[:-1]} {n + 1}",
+        "state": state if state != "all" else ("open", "closed")[n % 2],
+        "user": {"login": f"user-{n % 20}"},
+        "html_url": f"https://github.com/{owner}/{repo}/{kind}/{n + 1}",
+        "body": f"Body of {kind[:-1]} {n + 1} in {owner}/{repo}",
+    } for n in _page(CONFIG["issues"], page, per_page)]
+
+
+@mcp.tool(structured_output=False)
+async def list_issues(owner: str, repo: str, state: str = "open", sort: str = "created",
+                      direction: str = "desc", per_page: int = 30, page: int = 1) -> str:
+    await _simulate("list_issues")
+    return json.dumps(_issues(owner, repo, state, per_page, page))
+
+
+@mcp.tool(structured_output=False)
+async def list_pull_requests(owner: str, repo: str, state: str = "open", sort: str = "created",
+                             direction: str = "desc", per_page: int = 30, page: int = 1) -> str:
+    await _simulate("list_pull_requests")
+    return json.dumps(_issues(owner, repo, state, per_page, page, pulls=True))
+
+
+@mcp.tool(structured_output=False)
+async def get_file_contents(owner: str, repo: str, path: str, ref: str = None) -> str:
+    await _simulate("get_file_contents")
+    path = path.strip("/")
+    if path in TREE:
+        entries = []
+        for name, is_dir in TREE[path]:
+            child = f"{path}/{name}".lstrip("/")
+            size = 0 if is_dir else len(_file_content(owner, repo, child))
+            entries.append({
+                "type": "dir" if is_dir else "file",
+                "name": name,
+                "path": child,
+                "size": size,
+                "sha": _digest(owner, repo, ref, child),
+            })
+        return json.dumps(entries)
+
+    parent, _, name = path.rpartition("/")
+    if (name, False) not in TREE.get(parent, []):
+        raise RuntimeError(f"404 Not Found: {path}")
+    content = _file_content(owner, repo, path)
+    return json.dumps({
+        "type": "file",
+        "name": name,
+        "path": path,
+        "size": len(content),
+        "sha": _digest(owner, repo, ref, path),
+        "encoding": "base64",
+        "content": base64.b64encode(content.encode()).decode(),
+    })
+
+
+@mcp.tool(structured_output=False)
+async def get_user(username: str) -> str:
+    await _simulate("get_user")
+    return json.dumps({
+        "login": username,
+        "id": int(_digest(username)[:8], 16),
+        "name": username.replace("-", " ").title(),
+        "public_repos": int(_digest(username)[:2], 16),
+        "html_url": f"https://github.com/{username}",
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake GitHub MCP server (stdio)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean injected latency in milliseconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform latency jitter in milliseconds")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="Fraction of calls with the tail latency added")
+    parser.add_argument("--tail-latency", type=float, default=0.0, help="Extra latency of slow calls in milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls returning a server error")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of calls returning a rate-limit error")
+    parser.add_argument("--issues", type=int, default=CONFIG["issues"], help="Issues and pull requests per repository")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency and failure injection")
+    args = parser.parse_args()
+
+    CONFIG.update({
+        "latency": args.latency / 1000,
+        "jitter": args.jitter / 1000,
+        "tail_rate": args.tail_rate,
+        "tail_latency": args.tail_latency / 1000,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+        "issues": args.issues,
+    })
+    _random.seed(args.seed)
+    mcp.run("stdio")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Jira Cloud REST API.
+
+Serves the endpoints the jira_extractor code uses (serverInfo, field, search,
+issue, issue/bulk, issue deletion) over plain HTTP with a synthetic project,
+so the Jira code paths can be benchmarked without network access or
+credentials.
+
+Connection setup cost (TLS handshake in real life) and per-request latency
+are injected, and connections/requests are counted and served at /_stats:
+    --latency      per-request latency in milliseconds
+    --handshake    extra latency on every new connection in milliseconds
+    --rate-limit   requests per second before answering 429 with Retry-After
+
+Point the extractor at it with JIRA_SERVER=http://127.0.0.1:<port>, or start
+it in-process with start_server().
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_KEY = "SCRUM"
+
+WORDS = [
+    "authentication", "login", "signup", "database", "schema", "api", "endpoint",
+    "kubernetes", "deployment", "pipeline", "logging", "monitoring", "tests",
+    "performance", "frontend", "state", "backup", "documentation", "validation",
+    "notification", "mobile", "responsive", "balancing", "search", "onboarding",
+    "security", "cache", "dashboard", "payments", "migration",
+]
+
+TEMPLATES = [
+    "Implement {a} for {b}",
+    "Fix {a} bug in {b}",
+    "Add {a} support to {b}",
+    "Refactor {b} {a}",
+    "Improve {a} of {b} service",
+]
+
+FIELDS = [
+    ("summary", "Summary"), ("description", "Description"), ("labels", "Labels"),
+    ("updated", "Updated"), ("created", "Created"), ("status", "Status"),
+    ("issuetype", "Issue Type"), ("project", "Project"),
+]
+
+
+class FakeJira:
+    """In-memory issue store plus request/connection accounting"""
+
+    def __init__(self, issues=500, latency=0.0, handshake=0.0, rate_limit=0, seed=0):
+        self.latency = latency
+        self.handshake = handshake
+        self.rate_limit = rate_limit
+        self.recent = deque()
+        self.lock = threading.Lock()
+        self.stats = {"connections": 0, "requests": 0, "throttled": 0, "paths": {}}
+        self.issues = {}
+        self.next_id = 1
+        rng = random.Random(seed)
+        start = datetime(2025, 1, 1)
+        for _ in range(issues):
+            a, b, c = rng.sample(WORDS, 3)
+            self._add({
+                "summary": rng.choice(TEMPLATES).format(a=a, b=b),
+                "description": f"As part of the {b} work, handle {a} and {c} for the {rng.choice(WORDS)} module.",
+                "labels": [a, c],
+            }, start + timedelta(minutes=rng.randrange(0, 500_000)))
+
+    def _add(self, fields, when=None):
+        when = when or datetime.utcnow()
+        number = self.next_id
+        self.next_id += 1
+        key = f"{PROJECT_KEY}-{number}"
+        stamp = when.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+        self.issues[key] = {
+            "id": str(10000 + number),
+            "key": key,
+            "fields": {
+                "summary": fields.get("summary", ""),
+                "description": fields.get("description"),
+                "labels": list(fields.get("labels", [])),
+                "created": stamp,
+                "updated": stamp,
+                "status": {"name": "To Do"},
+                "issuetype": {"name": (fields.get("issuetype") or {}).get("name", "Task")},
+                "project": {"key": (fields.get("project") or {}).get("key", PROJECT_KEY)},
+            },
+        }
+        return self.issues[key]
+
+    def search(self, jql, start_at=0, max_results=50, fields=None):
+        query, order = _split_order(jql or "")
+        predicate = _parse(query) if query.strip() else (lambda issue: True)
+        matches = [issue for issue in self.issues.values() if predicate(issue)]
+        descending = "desc" in order.lower()
+        sort_field = "updated" if "updated" in order.lower() else "created"
+        matches.sort(key=lambda i: (i["fields"][sort_field], int(i["id"])), reverse=descending)
+        page = matches[start_at:start_at + max_results]
+        return {
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(matches),
+            "issues": [_project(issue, fields) for issue in page],
+        }
+
+
+def _project(issue, fields):
+    """Issue JSON restricted to the requested fields"""
+    if not fields or any(f in ("*all", "*navigable") for f in fields):
+        selected = issue["fields"]
+    else:
+        selected = {f: issue["fields"][f] for f in fields if f in issue["fields"]}
+    return {"id": issue["id"], "key": issue["key"], "self": f"/rest/api/2/issue/{issue['id']}", "fields": selected}
+
+
+# --- Minimal JQL evaluator -------------------------------------------------
+
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|(,)|("(?:[^"\\]|\\.)*")|(~|>=|<=|!=|=|>|<)|([^\s(),"~=<>!]+))')
+
+
+def _split_order(jql):
+    match = re.search(r"\border\s+by\b", jql, re.IGNORECASE)
+    if not match:
+        return jql, ""
+    return jql[:match.start()], jql[match.end():]
+
+
+def _tokens(text):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Cannot parse JQL near: {text[pos:pos + 20]}")
+        pos = match.end()
+        lparen, rparen, comma, quoted, op, word = match.groups()
+        if quoted is not None:
+            tokens.append(("value", json.loads(quoted)))
+        elif op is not None:
+            tokens.append(("op", op))
+        elif word is not None:
+            upper = word.upper()
+            tokens.append(("kw", upper) if upper in ("AND", "OR", "IN", "NOT") else ("value", word))
+        else:
+            tokens.append(("punct", lparen or rparen or comma))
+    return tokens
+
+
+def _parse(text):
+    tokens = _tokens(text)
+    pos = [0]
+
+    def peek():
+        return tokens[pos[0]] if pos[0] < len(tokens) else (None, None)
+
+    def take():
+        token = peek()
+        pos[0] += 1
+        return token
+
+    def expr():
+        left = term()
+        while peek() == ("kw", "OR"):
+            take()
+            right = term()
+            left = (lambda l, r: lambda i: l(i) or r(i))(left, right)
+        return left
+
+    def term():
+        left = factor()
+        while peek() == ("kw", "AND"):
+            take()
+            right = factor()
+            left = (lambda l, r: lambda i: l(i) and r(i))(left, right)
+        return left
+
+    def factor():
+        if peek() == ("punct", "("):
+            take()
+            inner = expr()
+            take()
+            return inner
+        field = take()[1].lower()
+        kind, op = take()
+        negate = False
+        if (kind, op) == ("kw", "NOT"):
+            negate = True
+            kind, op = take()
+        if (kind, op) == ("kw", "IN"):
+            take()
+            values = []
+            while peek() != ("punct", ")"):
+                token = take()
+                if token[0] == "value":
+                    values.append(token[1])
+            take()
+            return _clause(field, "in", values, negate)
+        return _clause(field, op, take()[1], False)
+
+    return expr()
+
+
+def _text(issue):
+    fields = issue["fields"]
+    return " ".join([fields["summary"] or "", fields["description"] or "", " ".join(fields["labels"])]).lower()
+
+
+def _stamp(value):
+    value = value.replace("/", "-")
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%dT%H:%M")
+        except ValueError:
+            pass
+    raise ValueError(f"Unsupported date: {value}")
+
+
+def _clause(field, op, value, negate):
+    if op == "in":
+        values = [v.lower() for v in value]
+        if field == "labels":
+            check = lambda i: any(l.lower() in values for l in i["fields"]["labels"])
+        elif field in ("key", "issuekey"):
+            check = lambda i: i["key"].lower() in values
+        else:
+            check = lambda i: str(i["fields"].get(field, "")).lower() in values
+        return (lambda i: not check(i)) if negate else check
+
+    if op == "~":
+        words = re.findall(r"\w+", value.lower())
+        source = _text if field == "text" else (lambda i: str(i["fields"].get(field) or "").lower())
+        return lambda i: all(w in source(i) for w in words)
+
+    if field in ("updated", "created"):
+        bound = _stamp(value)
+        compare = {">=": lambda a: a >= bound, ">": lambda a: a > bound,
+                   "<=": lambda a: a <= bound, "<": lambda a: a < bound}[op]
+        return lambda i: compare(i["fields"][field][:16])
+
+    if field == "project":
+        return lambda i: i["fields"]["project"]["key"].lower() == value.lower()
+    if field == "labels":
+        return lambda i: value.lower() in [l.lower() for l in i["fields"]["labels"]]
+    if field in ("key", "issuekey"):
+        return lambda i: i["key"].lower() == value.lower()
+    return lambda i: str(i["fields"].get(field, "")).lower() == value.lower()
+
+
+# --- HTTP layer --------------------------------------------------------------
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    jira = None
+
+    def setup(self):
+        super().setup()
+        with self.jira.lock:
+            self.jira.stats["connections"] += 1
+        if self.jira.handshake:
+            time.sleep(self.jira.handshake)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _count(self, path):
+        """Account for a request, returns False if it is rate limited"""
+        now = time.monotonic()
+        with self.jira.lock:
+            self.jira.stats["requests"] += 1
+            self.jira.stats["paths"][path] = self.jira.stats["paths"].get(path, 0) + 1
+            if self.jira.rate_limit:
+                recent = self.jira.recent
+                while recent and recent[0] <= now - 1.0:
+                    recent.popleft()
+                if len(recent) >= self.jira.rate_limit:
+                    self.jira.stats["throttled"] += 1
+                    return False
+                recent.append(now)
+        if self.jira.latency:
+            time.sleep(self.jira.latency)
+        return True
+
+    def _route(self, method):
+        url = urlparse(self.path)
+        path = url.path.rstrip("/")
+        if path == "/_stats":
+            return self._send(200, self.jira.stats)
+        if not self._count(f"{method} {re.sub(r'/[A-Z]+-[0-9]+$', '/{key}', path)}"):
+            return self._send(429, {"errorMessages": ["Rate limit exceeded."]}, {"Retry-After": "1"})
+
+        if path == "/rest/api/2/serverInfo":
+            return self._send(200, {"versionNumbers": [1001, 0, 0], "version": "1001.0.0", "deploymentType": "Cloud"})
+        if path == "/rest/api/2/field":
+            return self._send(200, [{"id": fid, "key": fid, "name": name, "custom": False, "clauseNames": [fid]}
+                                   for fid, name in FIELDS])
+        if path == "/rest/api/2/myself":
+            return self._send(200, {"accountId": "fake", "displayName": "Fake User"})
+        if path in ("/rest/api/2/search", "/rest/api/2/search/jql"):
+            query = parse_qs(url.query)
+            params = {k: v[-1] for k, v in query.items()}
+            # Fields may be repeated and/or comma separated
+            params["fields"] = ",".join(query.get("fields", []))
+            if method == "POST":
+                params.update(self._body())
+            fields = params.get("fields") or ["*navigable"]
+            if isinstance(fields, str):
+                fields = fields.split(",")
+            # search/jql pages with an opaque nextPageToken instead of startAt
+            token_paging = path.endswith("/jql")
+            start_at = params.get("nextPageToken" if token_paging else "startAt") or 0
+            try:
+                result = self.jira.search(params.get("jql"), int(start_at), int(params.get("maxResults") or 50), fields)
+            except (ValueError, KeyError) as e:
+                return self._send(400, {"errorMessages": [f"Invalid JQL: {e}"]})
+            if token_paging:
+                end = result["startAt"] + len(result["issues"])
+                result = {"issues": result["issues"], "isLast": end >= result["total"]}
+                if not result["isLast"]:
+                    result["nextPageToken"] = str(end)
+            return self._send(200, result)
+        if path == "/rest/api/2/issue" and method == "POST":
+            with self.jira.lock:
+                issue = self.jira._add(self._body().get("fields", {}))
+            return self._send(201, {"id": issue["id"], "key": issue["key"], "self": f"/rest/api/2/issue/{issue['id']}"})
+        if path == "/rest/api/2/issue/bulk" and method == "POST":
+            created, errors = [], []
+            with self.jira.lock:
+                for number, update in enumerate(self._body().get("issueUpdates", [])):
+                    fields = update.get("fields", {})
+                    if not fields.get("summary"):
+                        errors.append({"status": 400, "failedElementNumber": number,
+                                       "elementErrors": {"errors": {"summary": "You must specify a summary."}}})
+                        continue
+                    issue = self.jira._add(fields)
+                    created.append({"id": issue["id"], "key": issue["key"], "self": f"/rest/api/2/issue/{issue['id']}"})
+            return self._send(201, {"issues": created, "errors": errors})
+        match = re.fullmatch(r"/rest/api/2/issue/([A-Z]+-[0-9]+)", path)
+        if match and match.group(1) in self.jira.issues:
+            return self._send(200, _project(self.jira.issues[match.group(1)], None))
+        return self._send(404, {"errorMessages": [f"Not found: {path}"]})
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_DELETE(self):
+        match = re.fullmatch(r"/rest/api/2/issue/([A-Z]+-[0-9]+)", urlparse(self.path).path)
+        self._count("DELETE /rest/api/2/issue/{key}")
+        with self.jira.lock:
+            deleted = bool(match and self.jira.issues.pop(match.group(1), None))
+        if deleted:
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        return self._send(404, {"errorMessages": ["Issue does not exist"]})
+
+
+def start_server(port=0, **options):
+    """
+    Start the fake Jira in a background thread.
+
+    Returns:
+        (server, jira) where server.server_address holds the bound port
+    """
+    jira = FakeJira(**options)
+    handler = type("BoundHandler", (Handler,), {"jira": jira})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, jira
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Jira Cloud REST API")
+    parser.add_argument("--port", type=int, default=8089, help="Port to listen on")
+    parser.add_argument("--issues", type=int, default=500, help="Number of synthetic issues")
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-request latency in milliseconds")
+    parser.add_argument("--handshake", type=float, default=0.0, help="Latency added to every new connection in milliseconds")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per second before answering 429 (0 = unlimited)")
+    args = parser.parse_args()
+
+    server, _ = start_server(args.port, issues=args.issues, latency=args.latency / 1000,
+                             handshake=args.handshake / 1000, rate_limit=args.rate_limit)
+    print(f"Fake Jira listening on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -30,31 +30,109 @@ const handleSendMessage = async () => {
   setMessages((prev) => [...prev, userMessage]);
   setInputValue("");
 
+  // Placeholder agent message, updated while the workflow progresses
+  const agentId = (Date.now() + 1).toString();
+  setMessages((prev) => [
+    ...prev,
+    { id: agentId, content: "Working on it...", sender: "agent", timestamp: new Date() },
+  ]);
+  const updateAgentMessage = (content) => {
+    setMessages((prev) =>
+      prev.map((message) => (message.id === agentId ? { ...message, content, timestamp: new Date() } : message))
+    );
+  };
+
   try {
-    // Send the user message to Flask API using Axios
-    const response = await axios.post("http://localhost:5001/user-message", {
-      message: inputValue,  // Send the message as JSON in the body
-    }, {
-      headers: {
-        "Content-Type": "application/json", // Ensure the Content-Type is application/json
-      },
+    const data = await streamUserMessage(inputValue, updateAgentMessage);
+    updateAgentMessage(data.message);
+  } catch (error) {
+    console.error("Error streaming message from Flask server:", error);
+    // Once the stream was open the workflow has run (or failed) on the
+    // server, sending the message again would run it a second time
+    if (!error.streamUnavailable) {
+      updateAgentMessage(`Something went wrong: ${error.message}`);
+      return;
+    }
+    try {
+      // Send the user message to Flask API using Axios
+      const response = await axios.post("http://localhost:5001/user-message", {
+        message: inputValue,  // Send the message as JSON in the body
+      }, {
+        headers: {
+          "Content-Type": "application/json", // Ensure the Content-Type is application/json
+        },
+      });
+
+      // Display the response from the Flask API
+      updateAgentMessage(response.data.message);
+    } catch (error) {
+      console.error("Error sending message to Flask server:", error);
+      updateAgentMessage("Something went wrong, please try again.");
+    }
+  }
+};
+
+// Post the message to the streaming endpoint, showing the progress events
+// as they arrive. Resolves with the final payload (same as /user-message).
+// Errors thrown before the stream opened have streamUnavailable set, only
+// then is it safe to fall back to /user-message.
+const streamUserMessage = async (message, onProgress) => {
+  const unavailable = (error) => Object.assign(error, { streamUnavailable: true });
+
+  let response;
+  try {
+    response = await fetch("http://localhost:5001/user-message/stream", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ message }),
     });
+  } catch (error) {
+    throw unavailable(error);
+  }
+  if (!response.ok || !response.body) {
+    throw unavailable(new Error(`Streaming request failed: ${response.status}`));
+  }
 
-    const data = response.data; // Get the data from the response
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let tokens = "";
+  const sections = [];
 
-    // Display the response from the Flask API
-    const agentMessage = {
-      id: Date.now().toString(),
-      content: data.message,
-      sender: "agent",
-      timestamp: new Date(),
-    };
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
 
-    setMessages((prev) => [...prev, agentMessage]);
+    // Server-Sent Events are separated by a blank line
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
 
-  } catch (error) {
-    console.error("Error sending message to Flask server:", error);
+      let event = "message";
+      let data = "";
+      for (const line of frame.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+      }
+      if (!data) continue; // keep-alive comment
+
+      const payload = JSON.parse(data);
+      if (event === "result") return payload;
+      if (event === "error") throw new Error(payload.message);
+      if (event === "stage") {
+        onProgress(`Working on it... (${payload.stage})`);
+      } else if (event === "section") {
+        sections.push(payload.name);
+        onProgress(`Generating the assignment... (${sections.join(", ")})`);
+      } else if (event === "token") {
+        tokens += payload.text;
+        if (!sections.length) onProgress(tokens);
+      }
+    }
   }
+  throw new Error("Stream ended without a result");
 };
 
 
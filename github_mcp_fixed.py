@@ -3,11 +3,22 @@ import asyncio
 import logging
 import json
 import argparse
+import base64
+import fnmatch
+import inspect
+import os
+import sys
+import time
 import traceback
+from collections import deque
 from mcp import ClientSession
 from mcp.client.stdio import stdio_client
 from mcp import StdioServerParameters
 from contextlib import AsyncExitStack
+from mcp import types
+from github_mcp_scheduler import RateLimitScheduler
+from github_mcp_serialization import content_to_native, iter_result_items, result_to_native
+from local_code_index import LocalCodeRouter, to_call_tool_result
 
 # Set up logging
 logging.basicConfig(
@@ -16,35 +27,79 @@ logging.basicConfig(
 )
 logger = logging.getLogger("github_mcp")
 
+# Tools without side effects, the only ones that may be hedged
+READ_ONLY_TOOLS = frozenset({
+    "search_repositories",
+    "search_code",
+    "list_issues",
+    "list_pull_requests",
+    "get_file_contents",
+    "get_user",
+})
+
+# Calls observed before a tool's p95 is trusted as hedge delay
+HEDGE_MIN_SAMPLES = 20
+
 class GitHubMCPClient:
-    def __init__(self, container_name="GitHub-MCP-Server", timeout=60.0):  # Increased timeout to 60 seconds
+    def __init__(self, container_name="GitHub-MCP-Server", timeout=60.0, scheduler=None,
+                 server_params=None, pool_size=1, code_router=None, deadlines=None,
+                 hedge=False):  # Increased timeout to 60 seconds
         self.container_name = container_name
         self.timeout = timeout
+        # Every tool call is admitted through the rate-limit scheduler
+        self.scheduler = scheduler or RateLimitScheduler()
+        # Custom server command, e.g. a local stand-in instead of the Docker container
+        self.server_params = server_params
+        # Number of independent server sessions calls are spread over
+        self.pool_size = max(1, pool_size)
+        # Code searches on repositories cloned locally are answered from a local index,
+        # pass code_router=False to always use GitHub code search
+        self.code_router = LocalCodeRouter() if code_router is None else code_router
+        # Per-tool deadlines in seconds, tools not listed use `timeout`
+        self.deadlines = dict(deadlines or {})
+        # Duplicate slow read-only calls on a second pooled session
+        self.hedge = hedge
+        self._latencies = {}
+        self._hedge_stats = {"issued": 0, "won": 0}
         self.session = None
+        self.sessions = []
+        self._session_load = []
         self.available_tools = []
         self.exit_stack = AsyncExitStack()
     
+    async def _open_session(self, server_params):
+        """Start one server process and initialize an MCP session on it"""
+        # Use AsyncExitStack to manage the async context managers
+        logger.debug("Creating transport...")
+        read_stream, write_stream = await self.exit_stack.enter_async_context(stdio_client(server_params))
+        logger.debug("Transport created, setting up ClientSession...")
+        session = await self.exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
+        
+        logger.debug("Initializing session...")
+        await asyncio.wait_for(session.initialize(), timeout=self.timeout)
+        return session
+    
     async def connect(self):
         """Establish connection to the GitHub MCP server"""
-        logger.info(f"Connecting to GitHub MCP server in container '{self.container_name}'")
-        
-        # Add specific command to run the MCP server in the container
-        server_params = StdioServerParameters(
-            command="docker",
-            args=["exec", "-i", self.container_name, "./github-mcp-server", "stdio"]
-        )
+        server_params = self.server_params
+        if server_params is None:
+            logger.info(f"Connecting to GitHub MCP server in container '{self.container_name}'")
+            
+            # Add specific command to run the MCP server in the container
+            server_params = StdioServerParameters(
+                command="docker",
+                args=["exec", "-i", self.container_name, "./github-mcp-server", "stdio"]
+            )
+        else:
+            logger.info(f"Connecting to MCP server: {server_params.command} {' '.join(server_params.args)}")
         
         try:
-            # Use AsyncExitStack to manage the async context managers
-            logger.debug("Creating transport...")
-            transport = await self.exit_stack.enter_async_context(stdio_client(server_params))
-            self.read_stream, self.write_stream = transport
-            logger.debug("Transport created, setting up ClientSession...")
-            self.session = await self.exit_stack.enter_async_context(ClientSession(self.read_stream, self.write_stream))
-            
-            logger.debug("Initializing session...")
-            await asyncio.wait_for(self.session.initialize(), timeout=self.timeout)
-            logger.info("Session initialized successfully")
+            # Sessions are opened one after another, the exit stack must be entered from this task
+            for _ in range(self.pool_size):
+                self.sessions.append(await self._open_session(server_params))
+            self._session_load = [0] * len(self.sessions)
+            self.session = self.sessions[0]
+            logger.info(f"Session initialized successfully (pool size {len(self.sessions)})")
             
             # Get available tools
             tools_response = await self.session.list_tools()
@@ -61,13 +116,90 @@ class GitHubMCPClient:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return False
     
+    def _pick_session(self):
+        """Index of the pooled session with the fewest calls in flight"""
+        return min(range(len(self.sessions)), key=self._session_load.__getitem__)
+    
+    async def _call_on(self, index, name, arguments):
+        """Call a tool on one pooled session"""
+        self._session_load[index] += 1
+        try:
+            return await self.sessions[index].call_tool(name, arguments)
+        finally:
+            self._session_load[index] -= 1
+    
+    def _hedge_delay(self, name):
+        """Observed p95 latency of a tool, or None if the call must not be hedged"""
+        if not self.hedge or name not in READ_ONLY_TOOLS or len(self.sessions) < 2:
+            return None
+        samples = self._latencies.get(name)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+    
+    async def _call_hedged(self, name, arguments):
+        """Call a tool, duplicating it on another session if it outlives its p95"""
+        index = self._pick_session()
+        delay = self._hedge_delay(name)
+        start = time.monotonic()
+        primary = asyncio.ensure_future(self._call_on(index, name, arguments))
+        hedge = None
+        try:
+            if delay is None:
+                return await primary
+            
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self.scheduler.try_acquire(name):
+                return await primary
+            
+            hedge_index = min((i for i in range(len(self.sessions)) if i != index),
+                              key=self._session_load.__getitem__)
+            logger.debug(f"Hedging '{name}' on session {hedge_index} after {delay:.3f}s")
+            hedge = asyncio.ensure_future(self._call_on(hedge_index, name, arguments))
+            self._hedge_stats["issued"] += 1
+            
+            # First successful answer wins, a failure waits for the other call
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._hedge_stats["won"] += 1
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+            # Latency of the call as a whole, also when a hedge won or the
+            # deadline cancelled it, so slow calls aren't missing from the p95
+            self._latencies.setdefault(name, deque(maxlen=200)).append(time.monotonic() - start)
+    
+    async def _call_session(self, name, arguments):
+        """Call a tool on the pool within the tool's deadline"""
+        deadline = self.deadlines.get(name, self.timeout)
+        try:
+            return await asyncio.wait_for(self._call_hedged(name, arguments), timeout=deadline)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Tool '{name}' did not return within its {deadline} second deadline")
+    
+    async def _call_tool(self, name, arguments, priority=None):
+        """Call an MCP tool once the scheduler admits it"""
+        return await self.scheduler.run(
+            name,
+            lambda: self._call_session(name, arguments),
+            priority
+        )
+
     async def search_repositories(self, query, sort="stars", order="desc", per_page=30, page=1):
         """Search for GitHub repositories"""
         if not self.session:
             raise RuntimeError("Session not initialized. Call connect() first.")
         
         logger.info(f"Searching repositories with query: {query}")
-        result = await self.session.call_tool(
+        result = await self._call_tool(
             "search_repositories",
             {
                 "query": query,
@@ -100,8 +232,16 @@ class GitHubMCPClient:
         if repo and owner:
             params["repo"] = f"{owner}/{repo}"
         
+        if self.code_router:
+            local = await asyncio.to_thread(
+                self.code_router.search, query, params.get("repo"), filename, extension, page, per_page
+            )
+            if local is not None:
+                logger.info(f"Searching code locally with query: {query}")
+                return to_call_tool_result(local)
+        
         logger.info(f"Searching code with query: {query}")
-        result = await self.session.call_tool("search_code", params)
+        result = await self._call_tool("search_code", params)
         return result
         
     async def get_repository(self, owner, repo):
@@ -110,7 +250,7 @@ class GitHubMCPClient:
             raise RuntimeError("Session not initialized. Call connect() first.")
         
         logger.info(f"Getting repository information for: {owner}/{repo}")
-        result = await self.session.call_tool(
+        result = await self._call_tool(
             "search_repositories", 
             {"query": f"repo:{owner}/{repo}"}
         )
@@ -122,7 +262,7 @@ class GitHubMCPClient:
             raise RuntimeError("Session not initialized. Call connect() first.")
         
         logger.info(f"Listing issues for repository: {owner}/{repo}")
-        result = await self.session.call_tool(
+        result = await self._call_tool(
             "list_issues",
             {
                 "owner": owner,
@@ -152,7 +292,7 @@ class GitHubMCPClient:
             params["labels"] = labels
             
         logger.info(f"Creating issue in repository: {owner}/{repo}")
-        result = await self.session.call_tool("create_issue", params)
+        result = await self._call_tool("create_issue", params)
         return result
     
     async def list_pull_requests(self, owner, repo, state="open", sort="created", direction="desc", per_page=30, page=1):
@@ -161,7 +301,7 @@ class GitHubMCPClient:
             raise RuntimeError("Session not initialized. Call connect() first.")
         
         logger.info(f"Listing pull requests for repository: {owner}/{repo}")
-        result = await self.session.call_tool(
+        result = await self._call_tool(
             "list_pull_requests",
             {
                 "owner": owner,
@@ -190,7 +330,7 @@ class GitHubMCPClient:
             params["ref"] = ref
             
         logger.info(f"Getting file contents: {owner}/{repo}/{path}")
-        result = await self.session.call_tool("get_file_contents", params)
+        result = await self._call_tool("get_file_contents", params)
         return result
         
     async def get_user(self, username):
@@ -199,20 +339,190 @@ class GitHubMCPClient:
             raise RuntimeError("Session not initialized. Call connect() first.")
         
         logger.info(f"Getting user information for: {username}")
-        result = await self.session.call_tool("get_user", {"username": username})
+        result = await self._call_tool("get_user", {"username": username})
         return result
     
+    async def fetch_tree(self, owner, repo, path="/", ref=None, include=None, exclude=None,
+                         max_file_size=1_000_000, concurrency=8, dest_dir=None, on_file=None):
+        """
+        Fetch a whole subtree of a repository (listing plus file contents).
+        
+        Directories are listed and files downloaded with at most `concurrency`
+        calls in flight, and every file is handed over as soon as it arrives.
+        
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            path: Subtree to fetch, the repository root ("/") by default,
+                or a single file
+            ref: The name of the commit/branch/tag
+            include: Glob patterns a file must match, e.g. ["src/**", "*.json"].
+                Patterns without a '/' are matched against the file name.
+            exclude: Glob patterns of files to skip
+            max_file_size: Files larger than this many bytes are skipped
+            concurrency: Maximum number of calls in flight
+            dest_dir: Directory the files are written to, keeping their paths
+            on_file: Callback (or coroutine function) called with (path, data)
+            
+        Returns:
+            Dictionary with the fetched and skipped files, errors and byte count
+        """
+        if not self.session:
+            raise RuntimeError("Session not initialized. Call connect() first.")
+        
+        logger.info(f"Fetching tree: {owner}/{repo}/{path} at {ref or 'default branch'}")
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        report = {"success": True, "files": [], "skipped": [], "errors": {}, "bytes": 0}
+        
+        async def fetch(entry_path):
+            async with semaphore:
+                result = await self.get_file_contents(owner, repo, entry_path, ref)
+            if result.isError:
+                raise RuntimeError(result_to_native(result)["content"])
+            return [content_to_native(part) for part in result.content]
+        
+        async def save(file_path, data):
+            if dest_dir:
+                target = os.path.abspath(os.path.join(dest_dir, file_path))
+                if not target.startswith(os.path.abspath(dest_dir) + os.sep):
+                    raise ValueError(f"Refusing to write outside of {dest_dir}: {file_path}")
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, "wb") as f:
+                    f.write(data)
+            if on_file:
+                returned = on_file(file_path, data)
+                if inspect.isawaitable(returned):
+                    await returned
+        
+        async def fetch_file(entry):
+            file_path = entry["path"]
+            try:
+                parts = await fetch(file_path)
+                data = _file_bytes(parts)
+                if data is None:
+                    raise ValueError("Unexpected file contents response")
+                await save(file_path, data)
+                report["files"].append(file_path)
+                report["bytes"] += len(data)
+            except Exception as e:
+                report["errors"][file_path] = str(e)
+        
+        async def walk(dir_path):
+            try:
+                # The GitHub MCP server requires a path, "/" is the root
+                parts = await fetch(dir_path or "/")
+            except Exception as e:
+                report["errors"][dir_path or "/"] = str(e)
+                return
+            if not (parts and isinstance(parts[0], list)):
+                # Not a directory listing: `path` names a single file
+                data = _file_bytes(parts)
+                if data is None:
+                    report["errors"][dir_path or "/"] = "Unexpected contents response, neither a directory nor a file"
+                elif len(data) > max_file_size:
+                    report["skipped"].append(dir_path)
+                else:
+                    try:
+                        await save(dir_path, data)
+                        report["files"].append(dir_path)
+                        report["bytes"] += len(data)
+                    except Exception as e:
+                        report["errors"][dir_path] = str(e)
+                return
+            entries = parts[0]
+            
+            tasks = []
+            for entry in entries:
+                entry_path = entry.get("path", "")
+                if entry.get("type") == "dir":
+                    if _may_contain_matches(entry_path, include):
+                        tasks.append(walk(entry_path))
+                elif entry.get("type") == "file":
+                    if not _matches_globs(entry_path, include, exclude):
+                        continue
+                    if entry.get("size", 0) > max_file_size:
+                        report["skipped"].append(entry_path)
+                        continue
+                    tasks.append(fetch_file(entry))
+            await asyncio.gather(*tasks)
+        
+        await walk(path.strip("/"))
+        
+        report["files"].sort()
+        report["skipped"].sort()
+        report["success"] = not report["errors"]
+        report["message"] = (f"Fetched {len(report['files'])} files ({report['bytes']} bytes), "
+                             f"skipped {len(report['skipped'])}, {len(report['errors'])} errors")
+        logger.info(report["message"])
+        return report
+    
+    def metrics(self):
+        """Queue depth, wait time and rate-limit metrics from the scheduler, plus hedging counters"""
+        metrics = self.scheduler.metrics()
+        metrics["hedging"] = dict(self._hedge_stats)
+        return metrics
+
     async def close(self):
         """Close the session"""
         if self.exit_stack:
             logger.info("Closing session")
             await self.exit_stack.aclose()
             self.session = None
+            self.sessions = []
+            self._session_load = []
+
+
+def _matches_globs(path, include=None, exclude=None):
+    """Check a file path against include/exclude globs"""
+    def matches(pattern):
+        if "/" in pattern:
+            return fnmatch.fnmatch(path, pattern)
+        return fnmatch.fnmatch(os.path.basename(path), pattern)
+    
+    if include and not any(matches(pattern) for pattern in include):
+        return False
+    return not (exclude and any(matches(pattern) for pattern in exclude))
+
+
+def _may_contain_matches(dir_path, include=None):
+    """Check whether a directory can contain files matching the include globs"""
+    if not include:
+        return True
+    for pattern in include:
+        if "/" not in pattern:
+            return True
+        # Literal prefix of the pattern, up to the first wildcard
+        prefix = pattern
+        for i, char in enumerate(pattern):
+            if char in "*?[":
+                prefix = pattern[:i]
+                break
+        if prefix.startswith(dir_path + "/") or (dir_path + "/").startswith(prefix):
+            return True
+    return False
+
+
+def _file_bytes(parts):
+    """Extract the raw bytes of a file from native get_file_contents content parts"""
+    for part in parts:
+        if isinstance(part, dict) and "content" in part and part.get("encoding") == "base64":
+            return base64.b64decode(part["content"])
+        if isinstance(part, dict) and "blob" in part:
+            return base64.b64decode(part["blob"])
+        if isinstance(part, dict) and "uri" in part and "content" in part:
+            content = part["content"]
+            return (content if isinstance(content, str) else json.dumps(content)).encode("utf-8")
+    return None
 
 
 class JSONEncoderWithCallToolResult(json.JSONEncoder):
     def default(self, obj):
-        # Convert any object to a serializable format
+        # MCP results and content parts are converted to native structures
+        if isinstance(obj, types.CallToolResult):
+            return result_to_native(obj)
+        if hasattr(obj, 'model_dump'):
+            return content_to_native(obj)
+        # Convert any other object to a serializable format
         try:
             return super().default(obj)
         except TypeError:
@@ -220,7 +530,10 @@ class JSONEncoderWithCallToolResult(json.JSONEncoder):
 
 def serialize_result(result):
     """Convert a result object to a JSON-serializable format"""
-    if hasattr(result, 'result'):
+    if isinstance(result, types.CallToolResult):
+        # Decode the content parts instead of stringifying them
+        result_data = result_to_native(result)
+    elif hasattr(result, 'result'):
         # If the object has a 'result' attribute, use that
         result_data = result.result
     elif hasattr(result, '__dict__'):
@@ -232,6 +545,187 @@ def serialize_result(result):
     return result_data
 
 
+# Client methods that can be planned and run as operations by main()
+OPERATIONS = (
+    "search_repositories",
+    "search_code",
+    "get_repository",
+    "list_issues",
+    "list_pull_requests",
+    "get_file_contents",
+    "get_user",
+    "fetch_tree",
+)
+
+
+def split_repo(full_name):
+    """Split 'owner/repo' into (owner, repo)"""
+    try:
+        owner, repo = full_name.split("/")
+    except ValueError:
+        raise ValueError("Repository must be in format 'owner/repo'")
+    return owner, repo
+
+
+def plan_operations(args):
+    """
+    Build the list of operations requested on the command line.
+
+    Returns:
+        List of (operation, kwargs) tuples in the order results are printed
+    """
+    operations = []
+    owner = repo = None
+    if args.repo:
+        owner, repo = split_repo(args.repo)
+
+    if args.search:
+        operations.append(("search_repositories", {"query": args.search}))
+
+    if args.search_code:
+        operations.append(("search_code", {
+            "query": args.search_code,
+            "filename": args.filename,
+            "extension": args.extension,
+            "owner": owner,
+            "repo": repo
+        }))
+
+    if args.repo and args.fetch_tree:
+        operations.append(("fetch_tree", {
+            "owner": owner,
+            "repo": repo,
+            "path": args.path or "/",
+            "ref": args.ref,
+            "include": args.include,
+            "exclude": args.exclude,
+            "max_file_size": args.max_file_size,
+            "dest_dir": args.fetch_tree
+        }))
+    elif args.repo and args.path:
+        operations.append(("get_file_contents", {
+            "owner": owner,
+            "repo": repo,
+            "path": args.path,
+            "ref": args.ref
+        }))
+
+    if args.repo:
+        if args.list_issues:
+            operations.append(("list_issues", {"owner": owner, "repo": repo}))
+
+        if args.list_pulls:
+            operations.append(("list_pull_requests", {"owner": owner, "repo": repo}))
+
+        # If no specific operation is requested, get repository details
+        if not (args.list_issues or args.list_pulls or args.path or args.search_code or args.fetch_tree):
+            operations.append(("get_repository", {"owner": owner, "repo": repo}))
+
+    if args.user:
+        operations.append(("get_user", {"username": args.user}))
+
+    if args.batch:
+        operations.extend(load_batch(args.batch))
+
+    return operations
+
+
+def load_batch(path):
+    """
+    Read operations from a JSON lines file.
+
+    Each line is an object with an "op" key naming the operation and the
+    remaining keys as its arguments, for example:
+        {"op": "list_issues", "owner": "octocat", "repo": "hello-world"}
+    """
+    operations = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {e}")
+            if not isinstance(entry, dict):
+                raise ValueError(f"{path}:{line_number}: expected a JSON object, got {type(entry).__name__}")
+            op = entry.pop("op", None)
+            if op not in OPERATIONS:
+                raise ValueError(f"{path}:{line_number}: unknown operation '{op}'")
+            operations.append((op, entry))
+    return operations
+
+
+async def run_operations(client, operations, concurrency=5):
+    """
+    Run the planned operations concurrently, at most `concurrency` at a time.
+
+    Returns:
+        List of results (or exceptions) in the same order as `operations`
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(op, kwargs):
+        async with semaphore:
+            method = getattr(client, op)
+            return await method(**kwargs)
+
+    return await asyncio.gather(
+        *(run(op, kwargs) for op, kwargs in operations),
+        return_exceptions=True
+    )
+
+
+async def stream_operations(client, operations, out, concurrency=5):
+    """
+    Run the planned operations concurrently and write their items to `out`
+    as NDJSON, one line per item, as soon as each operation completes.
+
+    Every line is {"index": <operation index>, "op": <operation>, "item": ...};
+    a failed operation produces a single line with an "error" key instead.
+    Operations returning a report (fetch_tree) produce one line with the
+    report as the item, and count as failed when the report isn't a success.
+
+    Returns:
+        Number of failed operations
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(index, op, kwargs):
+        async with semaphore:
+            try:
+                return index, await getattr(client, op)(**kwargs), None
+            except Exception as e:
+                return index, None, e
+
+    failed = 0
+    tasks = [run(index, op, kwargs) for index, (op, kwargs) in enumerate(operations)]
+    for next_done in asyncio.as_completed(tasks):
+        index, result, error = await next_done
+        op = operations[index][0]
+        if error is not None:
+            failed += 1
+            out.write(json.dumps({"index": index, "op": op, "error": str(error)}) + "\n")
+        elif isinstance(result, types.CallToolResult):
+            if result.isError:
+                failed += 1
+                out.write(json.dumps({"index": index, "op": op, "error": result_to_native(result)["content"]}) + "\n")
+            else:
+                for item in iter_result_items(result):
+                    out.write(json.dumps({"index": index, "op": op, "item": item}, cls=JSONEncoderWithCallToolResult) + "\n")
+        elif isinstance(result, dict) and result.get("success") is False:
+            # Report of a composite operation (fetch_tree) that had errors
+            failed += 1
+            out.write(json.dumps({"index": index, "op": op, "error": result.get("message", "Operation failed"),
+                                  "item": result}, cls=JSONEncoderWithCallToolResult) + "\n")
+        else:
+            # Composite operations return one report instead of a tool result
+            out.write(json.dumps({"index": index, "op": op, "item": result}, cls=JSONEncoderWithCallToolResult) + "\n")
+        out.flush()
+    return failed
+
+
 async def main():
     """Main entry point for the GitHub MCP client"""
     parser = argparse.ArgumentParser(description="GitHub MCP Client")
@@ -247,6 +741,15 @@ async def main():
     parser.add_argument("--extension", help="Filter code search by file extension")
     parser.add_argument("--path", help="Get contents of a file at the specified path in the repository")
     parser.add_argument("--ref", help="The name of the commit/branch/tag for file contents")
+    parser.add_argument("--fetch-tree", metavar="DEST", help="Download the subtree at --path (default: root) of --repo into DEST")
+    parser.add_argument("--include", action="append", help="Glob of files to fetch with --fetch-tree (repeatable)")
+    parser.add_argument("--exclude", action="append", help="Glob of files to skip with --fetch-tree (repeatable)")
+    parser.add_argument("--max-file-size", type=int, default=1_000_000, help="Skip files larger than this many bytes with --fetch-tree")
+    parser.add_argument("--batch", help="JSON lines file with one operation per line")
+    parser.add_argument("--concurrency", type=int, default=5, help="Maximum number of operations run at once")
+    parser.add_argument("--ndjson", action="store_true", help="Stream result items as JSON lines as operations complete")
+    parser.add_argument("--pool-size", type=int, default=1, help="Number of MCP server sessions to spread calls over")
+    parser.add_argument("--hedge", action="store_true", help="Duplicate slow read-only calls on another pooled session")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
     
     args = parser.parse_args()
@@ -255,7 +758,14 @@ async def main():
     if not args.verbose:
         logging.getLogger().setLevel(logging.INFO)
     
-    client = GitHubMCPClient(container_name=args.container, timeout=args.timeout)
+    try:
+        operations = plan_operations(args)
+    except (OSError, ValueError) as e:
+        print(str(e))
+        return 1
+    
+    client = GitHubMCPClient(container_name=args.container, timeout=args.timeout,
+                             pool_size=args.pool_size, hedge=args.hedge)
     
     try:
         connected = await client.connect()
@@ -263,81 +773,25 @@ async def main():
             print("Failed to connect to the GitHub MCP server. Check logs for details.")
             return 1
         
-        # Handle repository search
-        if args.search:
-            result = await client.search_repositories(args.search)
-            result_data = serialize_result(result)
-            print(json.dumps(result_data, indent=2, cls=JSONEncoderWithCallToolResult))
-            
-        # Handle code search
-        if args.search_code:
-            # Check if we need to scope the search to a specific repo
-            owner = None
-            repo = None
-            if args.repo:
-                try:
-                    owner, repo = args.repo.split("/")
-                except ValueError:
-                    print("Repository must be in format 'owner/repo'")
-                    return 1
-                
-            result = await client.search_code(
-                query=args.search_code,
-                filename=args.filename,
-                extension=args.extension,
-                owner=owner,
-                repo=repo
-            )
-            result_data = serialize_result(result)
-            print(json.dumps(result_data, indent=2, cls=JSONEncoderWithCallToolResult))
+        if args.ndjson:
+            failed = await stream_operations(client, operations, sys.stdout, args.concurrency)
+            return 1 if failed else 0
         
-        # Handle file content retrieval
-        if args.repo and args.path:
-            try:
-                owner, repo = args.repo.split("/")
-            except ValueError:
-                print("Repository must be in format 'owner/repo'")
-                return 1
-            
-            file_contents = await client.get_file_contents(
-                owner=owner,
-                repo=repo,
-                path=args.path,
-                ref=args.ref
-            )
-            result_data = serialize_result(file_contents)
-            print(json.dumps(result_data, indent=2, cls=JSONEncoderWithCallToolResult))
+        results = await run_operations(client, operations, args.concurrency)
         
-        # Handle repository operations
-        if args.repo:
-            try:
-                owner, repo = args.repo.split("/")
-            except ValueError:
-                print("Repository must be in format 'owner/repo'")
-                return 1
-            
-            if args.list_issues:
-                issues = await client.list_issues(owner, repo)
-                result_data = serialize_result(issues)
-                print(json.dumps(result_data, indent=2, cls=JSONEncoderWithCallToolResult))
-            
-            if args.list_pulls:
-                pulls = await client.list_pull_requests(owner, repo)
-                result_data = serialize_result(pulls)
-                print(json.dumps(result_data, indent=2, cls=JSONEncoderWithCallToolResult))
-            
-            # If no specific operation is requested, get repository details
-            if not (args.list_issues or args.list_pulls or args.path or args.search_code):
-                repo_details = await client.get_repository(owner, repo)
-                result_data = serialize_result(repo_details)
-                print(json.dumps(result_data, indent=2, cls=JSONEncoderWithCallToolResult))
-        
-        # Handle user operations
-        if args.user:
-            user_details = await client.get_user(args.user)
-            result_data = serialize_result(user_details)
+        # Print results in plan order regardless of completion order
+        failed = False
+        for (op, kwargs), result in zip(operations, results):
+            if isinstance(result, Exception):
+                failed = True
+                logger.error(f"Operation {op} {kwargs} failed: {str(result)}")
+                continue
+            result_data = serialize_result(result)
             print(json.dumps(result_data, indent=2, cls=JSONEncoderWithCallToolResult))
         
+        if failed:
+            return 1
+        
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Rate-limit-aware admission control for the GitHub MCP client.
+
+GitHub enforces a primary hourly quota, much stricter quotas for the search
+endpoints and "secondary" limits on bursts and concurrency. The scheduler in
+this module sits in front of GitHubMCPClient and decides when each tool call
+may be sent:
+
+- every tool has its own token bucket, and the search tools additionally share
+  a stricter search bucket, on top of one global bucket for the primary quota
+- waiting calls are admitted in priority order, so interactive requests are
+  served before background prefetch, and background work can never use the
+  reserve kept for interactive users
+- rate-limit errors returned by the server put the affected bucket into an
+  exponential backoff and the call is retried
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import random
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("github_mcp_scheduler")
+
+
+class Priority(IntEnum):
+    """Priority classes, lower value is admitted first"""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+# Tools backed by the GitHub search API, which has a much lower quota
+SEARCH_TOOLS = frozenset({
+    "search_repositories",
+    "search_code",
+    "search_issues",
+    "search_users",
+})
+
+# Default limits as (tokens per second, burst capacity)
+DEFAULT_LIMITS = {
+    "core": (5000 / 3600, 100),      # Primary quota: 5000 requests per hour
+    "search": (30 / 60, 10),         # Search API: 30 requests per minute
+    "tool": (10.0, 20),              # Default per-tool bucket
+    "tools": {
+        "search_code": (10 / 60, 5),  # Code search: 10 requests per minute
+    },
+}
+
+RATE_LIMIT_PATTERN = re.compile(
+    r"rate limit|secondary rate|abuse detection|too many requests|\b429\b",
+    re.IGNORECASE
+)
+RETRY_AFTER_PATTERN = re.compile(r"retry[- ]after\D{0,5}(\d+)", re.IGNORECASE)
+
+_current_priority = contextvars.ContextVar("github_mcp_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def priority(level: Priority):
+    """
+    Run the calls made inside the block with the given priority class.
+
+    Example:
+        with priority(Priority.BACKGROUND):
+            await client.list_issues(owner, repo)
+    """
+    token = _current_priority.set(Priority(level))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class RateLimitError(RuntimeError):
+    """Raised when a call keeps hitting GitHub rate limits after all retries"""
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `rate` tokens per second.
+
+    Besides the tokens, the bucket carries a backoff deadline that is set when
+    the server reports that the limit behind this bucket was exceeded.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoff_streak = 0
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, now: float, reserve: float = 0.0) -> float:
+        """Seconds until one token can be taken while leaving `reserve` tokens untouched"""
+        self._refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        missing = 1.0 + reserve - self.tokens
+        if missing > 0:
+            if self.rate <= 0:
+                return float("inf")
+            wait = max(wait, missing / self.rate)
+        return wait
+
+    def consume(self, now: float):
+        self._refill(now)
+        self.tokens -= 1.0
+
+    def penalize(self, now: float, delay: float):
+        """Drain the bucket and block it for `delay` seconds"""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.blocked_until = max(self.blocked_until, now + delay)
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "tool", "future", "enqueued_at")
+
+    def __init__(self, priority, seq, tool, future, enqueued_at):
+        self.priority = priority
+        self.seq = seq
+        self.tool = tool
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RateLimitScheduler:
+    """
+    Priority scheduler with per-tool token buckets for MCP tool calls.
+
+    Args:
+        limits: Overrides for DEFAULT_LIMITS, same structure
+        max_in_flight: Maximum number of concurrent calls (secondary limit)
+        interactive_reserve: Fraction of each bucket that only interactive
+            calls may use, so bulk jobs cannot throttle interactive users
+        max_retries: Retries for a call that hit a rate limit
+        base_backoff: First backoff delay in seconds, doubled on every hit
+        max_backoff: Upper bound for the backoff delay in seconds
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Any]] = None, max_in_flight: int = 20,
+                 interactive_reserve: float = 0.2, max_retries: int = 3,
+                 base_backoff: float = 1.0, max_backoff: float = 120.0):
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits["tools"] = dict(DEFAULT_LIMITS["tools"])
+        if limits:
+            tools = limits.get("tools", {})
+            self.limits.update({k: v for k, v in limits.items() if k != "tools"})
+            self.limits["tools"].update(tools)
+
+        self.max_in_flight = max_in_flight
+        self.interactive_reserve = interactive_reserve
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._core = TokenBucket("core", *self.limits["core"])
+        self._search = TokenBucket("search", *self.limits["search"])
+        self._tool_buckets: Dict[str, TokenBucket] = {}
+
+        self._waiters = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._wakeup = None
+
+        # Metrics
+        self._wait_times = deque(maxlen=1000)
+        self._admitted = {p.name: 0 for p in Priority}
+        self._rate_limited = 0
+
+    def _buckets_for(self, tool: str) -> Tuple[TokenBucket, ...]:
+        bucket = self._tool_buckets.get(tool)
+        if bucket is None:
+            rate, capacity = self.limits["tools"].get(tool, self.limits["tool"])
+            bucket = self._tool_buckets[tool] = TokenBucket(tool, rate, capacity)
+        if tool in SEARCH_TOOLS:
+            return (self._core, self._search, bucket)
+        return (self._core, bucket)
+
+    def _pump(self):
+        """Admit every waiter that can run now, in priority order"""
+        self._wakeup = None
+        now = time.monotonic()
+        blocked = set()
+        next_wake = None
+        admitted = []
+
+        for waiter in sorted(self._waiters):
+            if waiter.future.done():
+                admitted.append(waiter)
+                continue
+            if self._in_flight >= self.max_in_flight:
+                break
+
+            buckets = self._buckets_for(waiter.tool)
+            if any(bucket.name in blocked for bucket in buckets):
+                continue
+
+            delays = []
+            for bucket in buckets:
+                reserve = 0.0
+                if waiter.priority > Priority.INTERACTIVE:
+                    reserve = bucket.capacity * self.interactive_reserve
+                delays.append((bucket, bucket.delay(now, reserve)))
+
+            wait = max(delay for _, delay in delays)
+            if wait <= 0:
+                for bucket in buckets:
+                    bucket.consume(now)
+                self._in_flight += 1
+                self._admitted[waiter.priority.name] += 1
+                self._wait_times.append(now - waiter.enqueued_at)
+                waiter.future.set_result(None)
+                admitted.append(waiter)
+            else:
+                # Keep the starved buckets for this waiter, lower priorities must not take them
+                blocked.update(bucket.name for bucket, delay in delays if delay > 0)
+                next_wake = wait if next_wake is None else min(next_wake, wait)
+
+        if admitted:
+            admitted = set(map(id, admitted))
+            self._waiters = [w for w in self._waiters if id(w) not in admitted]
+            heapq.heapify(self._waiters)
+
+        if next_wake is not None and self._waiters:
+            loop = asyncio.get_running_loop()
+            self._wakeup = loop.call_later(next_wake, self._pump)
+
+    def _reschedule(self):
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+        self._pump()
+
+    async def _acquire(self, tool: str, level: Priority):
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(level, next(self._seq), tool, loop.create_future(), time.monotonic())
+        heapq.heappush(self._waiters, waiter)
+        self._reschedule()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+
+    def _release(self):
+        self._in_flight -= 1
+        self._reschedule()
+
+    def try_acquire(self, tool: str) -> bool:
+        """
+        Take a token for an extra call (e.g. a hedged duplicate) without waiting.
+
+        Never uses the interactive reserve and does not count as in flight.
+        """
+        now = time.monotonic()
+        buckets = self._buckets_for(tool)
+        if any(bucket.delay(now, bucket.capacity * self.interactive_reserve) > 0 for bucket in buckets):
+            return False
+        for bucket in buckets:
+            bucket.consume(now)
+        return True
+
+    def _backoff(self, tool: str, message: str):
+        """Block the bucket whose limit was exceeded"""
+        now = time.monotonic()
+        bucket = self._search if tool in SEARCH_TOOLS else self._core
+        bucket.backoff_streak += 1
+
+        match = RETRY_AFTER_PATTERN.search(message or "")
+        if match:
+            delay = float(match.group(1))
+        else:
+            delay = min(self.max_backoff, self.base_backoff * 2 ** (bucket.backoff_streak - 1))
+            delay *= random.uniform(0.8, 1.2)
+
+        self._rate_limited += 1
+        bucket.penalize(now, delay)
+        logger.warning(f"Rate limit hit on '{tool}', backing off '{bucket.name}' for {delay:.1f}s")
+
+    def _succeeded(self, tool: str):
+        bucket = self._search if tool in SEARCH_TOOLS else self._core
+        bucket.backoff_streak = 0
+
+    async def run(self, tool: str, call: Callable[[], Awaitable[Any]], level: Optional[Priority] = None):
+        """
+        Run `call` once the scheduler admits it, retrying on rate-limit errors.
+
+        Args:
+            tool: Name of the MCP tool being called, selects the buckets
+            call: Zero-argument coroutine function performing the call
+            level: Priority class, defaults to the one set with `priority()`
+
+        Returns:
+            The result of `call`
+        """
+        level = Priority(_current_priority.get() if level is None else level)
+
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(tool, level)
+            try:
+                result = await call()
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                self._backoff(tool, str(e))
+                continue
+            finally:
+                self._release()
+
+            if is_rate_limit_error(result):
+                if attempt == self.max_retries:
+                    raise RateLimitError(f"'{tool}' still rate limited after {self.max_retries} retries")
+                self._backoff(tool, result_text(result))
+                continue
+
+            self._succeeded(tool)
+            return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, wait time and admission counters"""
+        waits = sorted(self._wait_times)
+        depth = {p.name: 0 for p in Priority}
+        for waiter in self._waiters:
+            depth[waiter.priority.name] += 1
+
+        def percentile(q):
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(q * len(waits)))]
+
+        return {
+            "queue_depth": len(self._waiters),
+            "queue_depth_by_priority": depth,
+            "in_flight": self._in_flight,
+            "admitted": dict(self._admitted),
+            "rate_limited": self._rate_limited,
+            "wait_time": {
+                "count": len(waits),
+                "mean": sum(waits) / len(waits) if waits else 0.0,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "max": waits[-1] if waits else 0.0,
+            },
+            "buckets": {
+                bucket.name: round(bucket.tokens, 2)
+                for bucket in (self._core, self._search, *self._tool_buckets.values())
+            },
+        }
+
+
+def result_text(result) -> str:
+    """Concatenated text parts of a CallToolResult"""
+    parts = getattr(result, "content", None) or []
+    return "\n".join(getattr(part, "text", "") or "" for part in parts)
+
+
+def is_rate_limit_error(result) -> bool:
+    """Check whether an exception or an error CallToolResult reports a rate limit"""
+    if isinstance(result, BaseException):
+        return bool(RATE_LIMIT_PATTERN.search(str(result)))
+    if not getattr(result, "isError", False):
+        return False
+    return bool(RATE_LIMIT_PATTERN.search(result_text(result)))
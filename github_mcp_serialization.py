@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Conversion of MCP tool results into native Python structures.
+
+The GitHub MCP server answers every tool call with a CallToolResult whose
+content parts usually carry a JSON document as text. The helpers here decode
+those parts once, into dicts and lists, so callers never have to parse a
+stringified repr again, and can iterate large search/list results item by
+item instead of materializing a single pretty-printed document.
+"""
+
+import json
+from typing import Any, Dict, Iterator
+
+from mcp import types
+
+_decoder = json.JSONDecoder()
+
+JSON_MIME_TYPES = ("application/json", "text/json")
+
+
+def _is_json_mime(mime_type) -> bool:
+    return bool(mime_type) and (mime_type in JSON_MIME_TYPES or mime_type.endswith("+json"))
+
+
+def _decode_text(text: str, mime_type=None) -> Any:
+    """Decode a text payload as JSON when it is (or claims to be) JSON"""
+    stripped = text.lstrip()
+    if _is_json_mime(mime_type) or stripped[:1] in ("{", "["):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+    return text
+
+
+def content_to_native(part) -> Any:
+    """
+    Convert a single MCP content part into a native structure.
+
+    - text parts holding JSON become dicts/lists, other text stays a string
+    - embedded resources become {"uri", "mimeType", "content"} with JSON decoded
+    - images, audio and blobs keep their base64 data with their mime type
+    """
+    if isinstance(part, types.TextContent):
+        return _decode_text(part.text)
+
+    if isinstance(part, types.EmbeddedResource):
+        resource = part.resource
+        data = {"uri": str(resource.uri), "mimeType": resource.mimeType}
+        if isinstance(resource, types.TextResourceContents):
+            data["content"] = _decode_text(resource.text, resource.mimeType)
+        else:
+            data["blob"] = resource.blob
+        return data
+
+    if isinstance(part, types.ImageContent):
+        return {"type": "image", "mimeType": part.mimeType, "data": part.data}
+
+    if hasattr(part, "model_dump"):
+        return part.model_dump(mode="json", exclude_none=True)
+
+    return part
+
+
+def result_to_native(result) -> Dict[str, Any]:
+    """
+    Convert a CallToolResult into {"isError": bool, "content": [...]}.
+
+    Structured content returned by the server, when present, is used as is
+    under "structuredContent".
+    """
+    data = {
+        "isError": bool(getattr(result, "isError", False)),
+        "content": [content_to_native(part) for part in result.content],
+    }
+    structured = getattr(result, "structuredContent", None)
+    if structured is not None:
+        data["structuredContent"] = structured
+    return data
+
+
+def _iter_json_array(text: str) -> Iterator[Any]:
+    """Yield the elements of a JSON array one by one without decoding it whole"""
+    index = text.index("[") + 1
+    length = len(text)
+    while True:
+        while index < length and text[index] in " \t\r\n,":
+            index += 1
+        if index >= length or text[index] == "]":
+            return
+        item, index = _decoder.raw_decode(text, index)
+        yield item
+
+
+def iter_result_items(result) -> Iterator[Any]:
+    """
+    Yield the individual items of a tool result.
+
+    JSON arrays are yielded element by element, search results
+    ({"total_count", "items": [...]}) yield their items, anything else is
+    yielded as a single native value.
+    """
+    for part in result.content:
+        if isinstance(part, types.TextContent) and part.text.lstrip()[:1] == "[":
+            yielded = 0
+            try:
+                for item in _iter_json_array(part.text):
+                    yielded += 1
+                    yield item
+                continue
+            except ValueError:
+                if yielded:
+                    raise
+
+        value = content_to_native(part)
+        if isinstance(value, list):
+            yield from value
+        elif isinstance(value, dict) and isinstance(value.get("items"), list):
+            yield from value["items"]
+        else:
+            yield value
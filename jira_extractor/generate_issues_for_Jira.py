@@ -1,23 +1,26 @@
-from jira import JIRA
+from jira import JIRA, JIRAError
+import hashlib
 import json
-import os
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from jira_extractor.jira_client import MAX_RETRIES, call_with_retry, get_jira_client, iter_jira_issues, retry_delay
+from jira_extractor.topic_cache import topic_cache
+
+# Jira accepts at most 50 issues per issue/bulk request
+BULK_CHUNK_SIZE = 50
+
+# Bulk requests running at once
+MAX_CONCURRENT_CHUNKS = 4
+
+# Label prefix marking issues created by the seeding job, see idempotency_label
+IDEMPOTENCY_LABEL_PREFIX = "seed-"
 
 def connect_to_jira() -> JIRA:
     """
-    Establishes connection to Jira using credentials from environment variables
+    Returns the shared Jira client, connecting with credentials from environment variables
     """
-    jira_server = "https://generated-interview-task.atlassian.net"
-    jira_email = os.getenv('JIRA_EMAIL') 
-    jira_api_token = os.getenv('JIRA_API_TOKEN')
-    
-    if not all([jira_server, jira_email, jira_api_token]):
-        raise ValueError("Missing required Jira credentials in environment variables")
-        
-    return JIRA(
-        server=jira_server,
-        basic_auth=(jira_email, jira_api_token)
-    )
+    return get_jira_client()
 
 def create_jira_issues(titles: List[str], project_key: str) -> List[str]:
     """
@@ -49,8 +52,121 @@ def create_jira_issues(titles: List[str], project_key: str) -> List[str]:
             
     return created_issues
 
+def idempotency_label(project_key: str, title: str) -> str:
+    """Label identifying an issue by its project and title, stable across runs"""
+    digest = hashlib.sha1(f"{project_key}\n{title}".encode("utf-8")).hexdigest()[:16]
+    return f"{IDEMPOTENCY_LABEL_PREFIX}{digest}"
+
+def _existing_issues(project_key: str, labels: List[str]) -> Dict[str, str]:
+    """Map of idempotency label -> key for the labels already used in the project"""
+    quoted = ", ".join(f'"{label}"' for label in labels)
+    jql = f'project = "{project_key}" AND labels in ({quoted})'
+    wanted = set(labels)
+    existing = {}
+    for issue in iter_jira_issues(jql, fields=("labels",)):
+        for label in issue["labels"] or []:
+            if label in wanted:
+                existing.setdefault(label, issue["key"])
+    return existing
+
+def _create_chunk(jira: JIRA, project_key: str, chunk: List[dict], idempotent: bool) -> List[dict]:
+    reports = {item["label"]: None for item in chunk}
+
+    def mark_existing():
+        missing = [label for label, report in reports.items() if report is None]
+        for label, key in _existing_issues(project_key, missing).items():
+            reports[label] = {"success": True, "key": key, "created": False, "message": "Issue already exists"}
+
+    if idempotent:
+        mark_existing()
+
+    attempt = 0
+    pending = [item for item in chunk if reports[item["label"]] is None]
+    while pending:
+        try:
+            # Creating isn't idempotent, only retry throttling (rejected before anything is created)
+            results = call_with_retry(jira.create_issues, [item["fields"] for item in pending],
+                                      prefetch=False, retry_statuses=(429,))
+        except JIRAError as e:
+            # A 503 can come after part of the chunk was created: look the
+            # labels up again and only retry the issues that are still missing
+            if e.status_code == 503 and idempotent and attempt < MAX_RETRIES:
+                attempt += 1
+                time.sleep(retry_delay(e, attempt))
+                mark_existing()
+                pending = [item for item in pending if reports[item["label"]] is None]
+                continue
+            results = [{"status": "Error", "error": str(e), "issue": None}] * len(pending)
+        except Exception as e:
+            results = [{"status": "Error", "error": str(e), "issue": None}] * len(pending)
+
+        for item, result in zip(pending, results):
+            if result["status"] == "Success":
+                reports[item["label"]] = {"success": True, "key": result["issue"].key, "created": True,
+                                          "message": "Issue created"}
+            else:
+                reports[item["label"]] = {"success": False, "key": None, "created": False,
+                                          "message": f"Failed to create issue: {result['error']}"}
+        break
+
+    return [dict(reports[item["label"]], title=item["title"]) for item in chunk]
+
+def create_jira_issues_bulk(titles: List[str], project_key: str, chunk_size: int = BULK_CHUNK_SIZE,
+                            max_workers: int = MAX_CONCURRENT_CHUNKS, idempotent: bool = True) -> List[dict]:
+    """
+    Creates Jira issues from a list of titles with the bulk-create endpoint
+
+    Titles are sent in chunks of chunk_size, max_workers chunks at a time.
+    With idempotent=True every issue carries a label derived from its project
+    and title, and titles whose label already exists in the project are not
+    created again, so a seeding job can be re-run safely.
+
+    Args:
+        titles: List of issue titles to create
+        project_key: The Jira project key where issues will be created
+        chunk_size: Issues per bulk request (at most 50)
+        max_workers: Bulk requests running at once
+        idempotent: Skip titles that were already created
+
+    Returns:
+        One report per unique title, in input order: {"title", "success",
+        "key", "created", "message"}
+    """
+    jira = connect_to_jira()
+
+    items = []
+    for title in dict.fromkeys(titles):
+        label = idempotency_label(project_key, title)
+        fields = {
+            'project': {'key': project_key},
+            'summary': title,
+            'description': title,
+            'issuetype': {'name': 'Task'}
+        }
+        if idempotent:
+            fields['labels'] = [label]
+        items.append({"title": title, "label": label, "fields": fields})
+
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    if not chunks:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+        reports = pool.map(lambda chunk: _create_chunk(jira, project_key, chunk, idempotent), chunks)
+        reports = [report for chunk_reports in reports for report in chunk_reports]
+
+    # New issues can match any cached topic search
+    if any(report["created"] for report in reports):
+        topic_cache.invalidate()
+    return reports
+
 def main(titles_list: List[str], project_key: str):
-    create_jira_issues(titles_list, project_key)    
+    reports = create_jira_issues_bulk(titles_list, project_key)
+    created = sum(report["created"] for report in reports)
+    failed = [report for report in reports if not report["success"]]
+    print(f"Created {created} issues, {len(reports) - created - len(failed)} already existed, {len(failed)} failed")
+    for report in failed:
+        print(f"Failed to create issue '{report['title']}': {report['message']}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+import functools
+import hashlib
+import logging
+from array import array
+from typing import Dict, List, Tuple
+from utils import normalize_text, shingles
+
+logger = logging.getLogger("issue_dedupe")
+
+# MinHash signature = BANDS * ROWS hashes, LSH buckets by band. Pairs above
+# roughly (1 / BANDS) ** (1 / ROWS) ~ 0.42 similarity become candidates
+BANDS = 32
+ROWS = 4
+
+# Exact Jaccard similarity of the shingles above which two summaries are the
+# same ticket. Short summaries differing in one word ("Add caching to user
+# service" / "... order service") reach ~0.65, so the bar sits above that
+SIMILARITY_THRESHOLD = 0.75
+
+_SIGNATURE_SIZE = BANDS * ROWS
+
+
+@functools.lru_cache(maxsize=65536)
+def _shingle_hashes(shingle: str) -> array:
+    # One SHAKE digest yields all the 32-bit hash functions of a shingle at once,
+    # deterministic across runs unlike hash()
+    return array("I", hashlib.shake_128(shingle.encode()).digest(4 * _SIGNATURE_SIZE))
+
+
+def minhash(shingle_set: set) -> List[int]:
+    """MinHash signature of a shingle set"""
+    return list(map(min, zip(*map(_shingle_hashes, shingle_set))))
+
+
+def _jaccard(first: set, second: set) -> float:
+    return len(first & second) / len(first | second)
+
+
+def dedupe_issues(issues: Dict[str, Dict[str, str]]) -> Tuple[Dict[str, Dict[str, str]], Dict[str, int]]:
+    """
+    Collapse repeated and near-identical issues of the topic search results.
+
+    An issue found under several topics is kept once, and issues whose
+    summaries are near-duplicates ("Implement X" / "Implement X v2") are
+    clustered (MinHash/LSH candidates, confirmed on the exact similarity to
+    the cluster leader) and represented by a single ticket. The
+    representative is listed under every topic of its cluster, so no topic
+    loses coverage.
+
+    Args:
+        issues: {topic: {issue_key: summary}}
+
+    Returns:
+        ({topic: {issue_key: summary}} with one issue per cluster,
+         {representative_key: cluster size})
+    """
+    summaries = {}
+    topics_of = {}
+    for topic, topic_issues in issues.items():
+        for key, summary in topic_issues.items():
+            summaries.setdefault(key, summary)
+            topics_of.setdefault(key, []).append(topic)
+
+    # Identical summaries are one text, only distinct texts go through LSH.
+    # Texts found under the most topics come first, so they lead the clusters
+    keys_of = {}
+    for key, summary in summaries.items():
+        keys_of.setdefault(normalize_text(summary), []).append(key)
+    texts = sorted(keys_of, key=lambda text: -max(len(topics_of[key]) for key in keys_of[text]))
+    shingle_sets = [shingles(text) for text in texts]
+
+    # Every text joins the most similar cluster leader above the threshold
+    # (confirmed on the exact Jaccard, LSH only proposes the candidates) or
+    # leads a new cluster. Members are compared with the leader only, so
+    # clusters don't chain through intermediate summaries
+    clusters = {}
+    buckets = {}
+    for index, shingle_set in enumerate(shingle_sets):
+        signature = minhash(shingle_set)
+        bands = [(band, tuple(signature[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+        candidates = {leader for band in bands for leader in buckets.get(band, ())}
+        best, best_similarity = None, SIMILARITY_THRESHOLD
+        for leader in candidates:
+            similarity = _jaccard(shingle_sets[leader], shingle_set)
+            if similarity >= best_similarity:
+                best, best_similarity = leader, similarity
+        if best is None:
+            clusters[index] = list(keys_of[texts[index]])
+            for band in bands:
+                buckets.setdefault(band, []).append(index)
+        else:
+            clusters[best].extend(keys_of[texts[index]])
+
+    deduped = {topic: {} for topic in issues}
+    sizes = {}
+    for members in clusters.values():
+        # The member found under the most topics stands for the cluster
+        representative = max(members, key=lambda key: len(topics_of[key]))
+        sizes[representative] = len(members)
+        for key in members:
+            for topic in topics_of[key]:
+                deduped[topic][representative] = summaries[representative]
+
+    total = sum(len(topic_issues) for topic_issues in issues.values())
+    logger.info(f"Deduplicated {total} topic issues: {len(summaries)} unique keys, {len(clusters)} clusters")
+    return deduped, sizes
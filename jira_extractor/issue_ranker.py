@@ -0,0 +1,128 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# A summary term counts this many times as much as a description term
+SUMMARY_WEIGHT = 2.0
+
+# Candidates handed to the LLM filter step
+TOP_K = 30
+
+# Issues the extractor returns
+FINAL_ISSUES = 10
+
+# The ranking is trusted without the LLM when the last selected issue scores
+# this many times higher than the first one left out
+DECISIVE_MARGIN = 1.5
+
+_WORD_PATTERN = re.compile(r"\w+")
+_SUFFIXES = ("ation", "ing", "ment", "ate", "ed", "er", "e")
+
+
+def stem(word: str) -> str:
+    """Light suffix stripping so "databases"/"database" and "authentication"/"authenticate" meet"""
+    if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, stemmed word tokens of a text"""
+    return [stem(word) for word in _WORD_PATTERN.findall((text or "").lower())]
+
+
+def rank_issues(issues: Dict[str, Dict[str, str]], topics: List[str],
+                descriptions: Optional[Dict[str, str]] = None) -> List[dict]:
+    """
+    Rank the issues found for the topics with BM25 over summary and description.
+
+    Every topic is a query of its own and the issue score is the sum of the
+    topic scores, each topic weighted by 1 / number of its words so multi-word
+    topics don't outweigh single keywords. Issues found under several topics
+    are scored once, against all of them.
+
+    Args:
+        issues: {topic: {issue_key: summary}} as returned by the topic searches
+        topics: Topics extracted from the tasks description
+        descriptions: Optional {issue_key: description}, summaries only otherwise
+
+    Returns:
+        [{"key", "summary", "score", "topics"}] sorted by descending score
+    """
+    descriptions = descriptions or {}
+    docs = {}
+    for topic, topic_issues in issues.items():
+        for key, summary in topic_issues.items():
+            doc = docs.setdefault(key, {"key": key, "summary": summary, "topics": []})
+            doc["topics"].append(topic)
+    if not docs:
+        return []
+
+    # Field-weighted term frequencies and lengths (BM25F with one shared b)
+    frequencies = {}
+    lengths = {}
+    for key, doc in docs.items():
+        summary_terms = tokenize(doc["summary"])
+        description_terms = tokenize(descriptions.get(key))
+        tf = Counter()
+        for term in summary_terms:
+            tf[term] += SUMMARY_WEIGHT
+        for term in description_terms:
+            tf[term] += 1.0
+        frequencies[key] = tf
+        lengths[key] = SUMMARY_WEIGHT * len(summary_terms) + len(description_terms)
+
+    average_length = sum(lengths.values()) / len(lengths) or 1.0
+    document_frequency = Counter(term for tf in frequencies.values() for term in tf)
+    total = len(docs)
+
+    def idf(term):
+        n = document_frequency.get(term, 0)
+        return math.log(1 + (total - n + 0.5) / (n + 0.5))
+
+    queries = [(terms, 1.0 / len(terms)) for terms in (set(tokenize(topic)) for topic in topics) if terms]
+
+    ranked = []
+    for key, doc in docs.items():
+        tf = frequencies[key]
+        norm = K1 * (1 - B + B * lengths[key] / average_length)
+        score = 0.0
+        for terms, weight in queries:
+            score += weight * sum(
+                idf(term) * tf[term] * (K1 + 1) / (tf[term] + norm)
+                for term in terms if term in tf
+            )
+        ranked.append(dict(doc, score=score))
+
+    ranked.sort(key=lambda doc: (-doc["score"], doc["key"]))
+    return ranked
+
+
+def is_decisive(ranked: List[dict], count: int = FINAL_ISSUES, margin: float = DECISIVE_MARGIN) -> bool:
+    """True if the top `count` issues can be returned without asking the LLM"""
+    if len(ranked) <= count:
+        return True
+    last_in, first_out = ranked[count - 1]["score"], ranked[count]["score"]
+    return last_in > 0 and last_in >= margin * first_out
+
+
+def top_candidates(ranked: List[dict], top_k: int = TOP_K, cluster_sizes: Optional[Dict[str, int]] = None) -> Dict[str, str]:
+    """
+    {issue_key: summary} of the top_k ranked issues, best first. With
+    cluster_sizes (see issue_dedupe) the summaries of issues standing for
+    several near-duplicates mention how many there are.
+    """
+    cluster_sizes = cluster_sizes or {}
+    candidates = {}
+    for doc in ranked[:top_k]:
+        size = cluster_sizes.get(doc["key"], 1)
+        candidates[doc["key"]] = doc["summary"] if size == 1 else f"{doc['summary']} ({size} similar issues)"
+    return candidates
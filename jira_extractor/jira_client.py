@@ -0,0 +1,178 @@
+from jira import JIRA, JIRAError
+import os
+import random
+import threading
+import time
+from typing import Dict, Iterator, Optional, Sequence
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+JIRA_SERVER = os.getenv("JIRA_SERVER", "https://generated-interview-task.atlassian.net")
+
+# Connections kept alive per host, enough for the concurrent topic searches
+POOL_SIZE = int(os.getenv("JIRA_POOL_SIZE", "16"))
+
+# "search" pages with startAt, "search/jql" (the newer Jira Cloud search) with nextPageToken
+SEARCH_ENDPOINT = os.getenv("JIRA_SEARCH_ENDPOINT", "search")
+SEARCH_PAGE_SIZE = 100
+
+# Retries of a call rejected with 429/503 before giving up
+MAX_RETRIES = int(os.getenv("JIRA_MAX_RETRIES", "5"))
+RETRY_STATUSES = (429, 503)
+MAX_RETRY_DELAY = 60
+
+# Seconds to wait for a Jira response (connect and read), so a slow Jira fails the call instead of hanging it
+REQUEST_TIMEOUT = float(os.getenv("JIRA_TIMEOUT", "30"))
+
+_client = None
+_client_lock = threading.Lock()
+
+# Shared cooldown: after a 429 every thread waits, not only the one that was throttled
+_cooldown_until = 0.0
+_cooldown_lock = threading.Lock()
+
+
+def _create_jira_client() -> JIRA:
+    jira_email = os.getenv("JIRA_EMAIL")
+    jira_api_token = os.getenv("JIRA_API_TOKEN")
+
+    if not all([JIRA_SERVER, jira_email, jira_api_token]):
+        raise ValueError("Missing required Jira credentials in environment variables")
+
+    jira = JIRA(
+        server=JIRA_SERVER,
+        basic_auth=(jira_email, jira_api_token),
+        # Skip the serverInfo round trip, only Jira Cloud is used
+        get_server_info=False,
+        # Throttling is handled by call_with_retry, coordinated across threads
+        max_retries=0,
+        timeout=REQUEST_TIMEOUT,
+    )
+
+    # Keep-alive connection pool shared by every thread using the client
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    jira._session.mount("https://", adapter)
+    jira._session.mount("http://", adapter)
+    return jira
+
+
+def get_jira_client() -> JIRA:
+    """
+    Return the process-wide JIRA client, creating it on first use.
+
+    The client (and its HTTP session) is shared by all callers and threads,
+    so the TLS handshake and field metadata lookups happen once per process
+    instead of once per search.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _create_jira_client()
+    return _client
+
+
+def reset_jira_client():
+    """
+    Close and drop the shared client, e.g. after the credentials changed.
+    The next get_jira_client() call creates a new one.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def retry_delay(error: JIRAError, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a throttled (429) or unavailable (503)
+    call: the response's Retry-After, capped at MAX_RETRY_DELAY, else
+    exponential backoff with jitter for the attempt (0-based).
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(MAX_RETRY_DELAY, max(1.0, float(retry_after)))
+        except ValueError:
+            pass
+    # No (parsable) Retry-After: exponential backoff with jitter
+    return min(MAX_RETRY_DELAY, 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def call_with_retry(func, *args, retry_statuses: Sequence[int] = RETRY_STATUSES, **kwargs):
+    """
+    Call a JIRA client method, retrying 429/503 responses after `Retry-After`.
+
+    A throttled call pauses every other call made through this function
+    until the cooldown has passed, so a thread pool backs off as a whole.
+
+    Non-idempotent calls should pass retry_statuses=(429,): a 503 from a
+    gateway can come after Jira already did part of the work.
+    """
+    global _cooldown_until
+    attempt = 0
+    while True:
+        wait = _cooldown_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            return func(*args, **kwargs)
+        except JIRAError as e:
+            if e.status_code not in retry_statuses or attempt >= MAX_RETRIES:
+                raise
+            attempt += 1
+            delay = retry_delay(e, attempt)
+            with _cooldown_lock:
+                _cooldown_until = max(_cooldown_until, time.monotonic() + delay)
+
+
+def iter_jira_issues(jql: str, fields: Sequence[str] = ("summary",), page_size: int = SEARCH_PAGE_SIZE,
+                     max_issues: Optional[int] = None, endpoint: str = SEARCH_ENDPOINT) -> Iterator[Dict]:
+    """
+    Stream the issues matching a JQL query, one page in memory at a time.
+
+    Only the given fields are requested and each issue is yielded as a
+    compact record {"id", "key", <field>: value, ...} built from the raw JSON,
+    without creating jira Issue resources.
+
+    Args:
+        jql: JQL query, including its ORDER BY
+        fields: Issue fields to request and return
+        page_size: Issues per request
+        max_issues: Stop after this many issues, None for all of them
+        endpoint: "search" (startAt paging) or "search/jql" (nextPageToken paging)
+    """
+    jira = get_jira_client()
+    fields = list(fields)
+    params = {"jql": jql, "fields": ",".join(fields)}
+    start = 0
+    token = None
+
+    while max_issues is None or start < max_issues:
+        page_params = dict(params, maxResults=page_size if max_issues is None else min(page_size, max_issues - start))
+        if endpoint == "search":
+            page_params["startAt"] = start
+        elif token:
+            page_params["nextPageToken"] = token
+
+        page = call_with_retry(jira._get_json, endpoint, params=page_params)
+        issues = page.get("issues", [])
+        for issue in issues:
+            issue_fields = issue.get("fields") or {}
+            record = {"id": issue["id"], "key": issue["key"]}
+            for field in fields:
+                record[field] = issue_fields.get(field)
+            yield record
+
+        start += len(issues)
+        token = page.get("nextPageToken")
+        if not issues or page.get("isLast"):
+            break
+        if endpoint == "search" and start >= page.get("total", 0):
+            break
+        if endpoint != "search" and not token:
+            break
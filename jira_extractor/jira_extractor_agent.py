@@ -1,22 +1,35 @@
-import os
-from openai import AzureOpenAI
-from jira_extractor.user_functions import get_jira_issues
+import asyncio
+import json
+import math
+from typing import Callable
+from jira_extractor.user_functions import (
+    get_jira_issues,
+    get_jira_issues_batched,
+    get_jira_issues_concurrent,
+    get_jira_issues_from_mirror,
+    search_topics_cached,
+)
+from jira_extractor.issue_dedupe import dedupe_issues
+from jira_extractor.issue_ranker import FINAL_ISSUES, is_decisive, rank_issues, top_candidates
+from jira_extractor.jira_mirror import get_jira_mirror
+from jira_extractor.topic_extractor import CONFIDENCE_THRESHOLD, extract_topics
+from llm_gateway import acomplete, complete, run
+from prompt_budget import count_tokens, minify
 from utils import extract_json_from_response
 
+# Map-reduce filtering: ranked candidates considered, prompt tokens per map
+# chunk, issues each chunk keeps and map calls running at once
+MAP_REDUCE_TOP_K = 300
+MAP_CHUNK_TOKENS = 3000
+MAP_SHORTLIST_SIZE = 10
+MAP_CONCURRENCY = 8
+
 class JiraExtractorAgent:
     def __init__(self):
-        self.endpoint = "https://ai-dentzbar2802ai654595622363.openai.azure.com/"
+        # Endpoint and credentials live in llm_gateway, the client is created on first call
+        self.llm_endpoint = "jira_extractor"
         self.model_name = "gpt-4.1"
         self.deployment = "gpt-4.1"
-        self.api_version = "2024-12-01-preview"
-        
-        self.subscription_key = os.getenv("AZURE_OPENAI_API_KEY_JIRA_EXT")
-        
-        self.client = AzureOpenAI(
-            api_version=self.api_version,
-            azure_endpoint=self.endpoint,
-            api_key=self.subscription_key,
-        )
 
     def topics_prompt(self, tasks_description_json: dict) -> str:
         prompt = f"""
@@ -42,7 +55,7 @@ class JiraExtractorAgent:
         the issues list is: 
         {issues_list}
         
-        return up to 10 issues that are most relevant to the topics.
+        return up to 10 issues (their summaries) that are most relevant to the topics.
 
         return your response in json format, like this:
         {{
@@ -51,8 +64,83 @@ class JiraExtractorAgent:
         """
         return prompt
 
-    def invoke(self, prompt: str, system_prompt: str) -> str:
-        response = self.client.chat.completions.create(
+    def shortlist_issues_prompt(self, issues: dict, topics_list: list, count: int) -> str:
+        prompt = f"""
+        your task is to shortlist the issues most relevant to the topics list.
+
+        the topics list is: 
+        {topics_list}
+
+        the issues, as issue key: summary, are: 
+        {json.dumps(issues, separators=(",", ":"))}
+        
+        return the keys of up to {count} issues that are most relevant to the topics.
+
+        return your response in json format, like this:
+        {{
+            "issues": ["KEY-1", "KEY-2", "KEY-3"]
+        }}
+        """
+        return prompt
+
+    async def _shortlist(self, chunk: dict, topics_list: list, semaphore: asyncio.Semaphore) -> list:
+        try:
+            async with semaphore:
+                response = await self.ainvoke(
+                    self.shortlist_issues_prompt(chunk, topics_list, MAP_SHORTLIST_SIZE),
+                    "You are a helpful assistant that filters issues based on a topic."
+                )
+            keys = [key for key in extract_json_from_response(response)["issues"] if key in chunk]
+        except Exception as e:
+            print(f"Shortlisting a chunk of {len(chunk)} issues failed, keeping its best ranked ones: {e}")
+            keys = []
+        # Issues are in ranking order, fill up with the best ranked ones if the LLM returned too few
+        return keys or list(chunk)[:MAP_SHORTLIST_SIZE]
+
+    async def _shortlist_chunks(self, chunks: list, topics_list: list, max_workers: int) -> list:
+        semaphore = asyncio.Semaphore(max_workers)
+        return await asyncio.gather(*(self._shortlist(chunk, topics_list, semaphore) for chunk in chunks))
+
+    async def afilter_issues_map_reduce(self, issues: dict, topics_list: list,
+                                        chunk_tokens: int = MAP_CHUNK_TOKENS, max_workers: int = MAP_CONCURRENCY) -> list:
+        """
+        Filter an issue set too large for one prompt.
+
+        Map: the issues ({issue_key: summary}, best ranked first) are dealt
+        round-robin into chunks of about chunk_tokens prompt tokens, so every
+        chunk gets some of the best ranked issues, and each chunk is
+        shortlisted by an LLM call, max_workers at a time.
+        Reduce: one filter_issues_prompt call picks the final issues from the
+        merged shortlists.
+
+        Returns:
+            Summaries of up to 10 issues, like the single-call filter
+        """
+        total_tokens = count_tokens(minify(issues))
+        chunk_count = max(1, math.ceil(total_tokens / chunk_tokens))
+        items = list(issues.items())
+
+        if chunk_count > 1:
+            chunks = [dict(items[i::chunk_count]) for i in range(chunk_count)]
+            shortlists = await self._shortlist_chunks(chunks, topics_list, max_workers)
+            shortlisted = set(key for keys in shortlists for key in keys)
+            # Keep the ranking order for the reduce prompt
+            issues = {key: summary for key, summary in items if key in shortlisted}
+
+        filter_issues_prompt = self.filter_issues_prompt(issues, topics_list)
+        filter_issues_response = await self.ainvoke(filter_issues_prompt, "You are a helpful assistant that filters issues based on a topic.")
+        return extract_json_from_response(filter_issues_response)["issues"]
+
+    def filter_issues_map_reduce(self, issues: dict, topics_list: list,
+                                 chunk_tokens: int = MAP_CHUNK_TOKENS, max_workers: int = MAP_CONCURRENCY) -> list:
+        """
+        afilter_issues_map_reduce for sync callers. It runs on the LLM gateway
+        loop, so it also works when the caller is inside a running event loop.
+        """
+        return run(self.afilter_issues_map_reduce(issues, topics_list, chunk_tokens, max_workers))
+
+    def _completion_args(self, prompt: str, system_prompt: str) -> dict:
+        return dict(
             messages=[
                 {
                     "role": "system", 
@@ -70,22 +158,72 @@ class JiraExtractorAgent:
             presence_penalty=0.0,
             model=self.deployment
         )
-        
+
+    def invoke(self, prompt: str, system_prompt: str) -> str:
+        response = complete(self.llm_endpoint, **self._completion_args(prompt, system_prompt))
+        return response.choices[0].message.content
+
+    async def ainvoke(self, prompt: str, system_prompt: str) -> str:
+        response = await acomplete(self.llm_endpoint, **self._completion_args(prompt, system_prompt))
         return response.choices[0].message.content
 
-def main(tasks_description_json: dict) -> dict:
+def main(tasks_description_json: dict, search_mode: str = "mirror", filter_mode: str = "single",
+         on_progress: Callable[[str, dict], None] = None) -> dict:
+    """
+    search_mode selects how the topics are searched in Jira:
+    "mirror" (local SQLite mirror, synced incrementally first), "batched"
+    (OR-ed JQL queries), "concurrent" (one query per topic on a thread pool)
+    or "serial" (one query per topic, one after another).
+
+    filter_mode selects how the LLM picks the final issues: "single" (one
+    call over the top ranked candidates) or "map_reduce" (concurrent calls
+    over chunks of 10x as many candidates, then one merging call).
+
+    on_progress, if given, is called as each stage finishes:
+    ("topics", {"topics": [...]}) and ("issues", {"found": n, "candidates": n}).
+    """
     agent = JiraExtractorAgent()
-    topics_prompt = agent.topics_prompt(tasks_description_json)
-    topics_response = agent.invoke(topics_prompt, "You are a helpful assistant that extracts topics from a description.")
-    topics_list = extract_json_from_response(topics_response)["topics"]
+    on_progress = on_progress or (lambda stage, data: None)
+
+    # Keyword lists are split locally, only prose needs the LLM
+    topics_list, confidence = extract_topics(tasks_description_json)
+    if confidence < CONFIDENCE_THRESHOLD:
+        topics_prompt = agent.topics_prompt(tasks_description_json)
+        topics_response = agent.invoke(topics_prompt, "You are a helpful assistant that extracts topics from a description.")
+        topics_list = extract_json_from_response(topics_response)["topics"]
     print(topics_list)
-
-    issues = {}
-
-    for topic in topics_list:
-        issues[topic] = get_jira_issues({"topic": topic})
-
-    filter_issues_prompt = agent.filter_issues_prompt(issues, topics_list)
+    on_progress("topics", {"topics": topics_list})
+
+    if search_mode == "mirror":
+        search = get_jira_issues_from_mirror
+    elif search_mode == "batched":
+        # One or two OR-ed JQL queries, issues attributed back to topics locally
+        search = get_jira_issues_batched
+    elif search_mode == "concurrent":
+        search = get_jira_issues_concurrent
+    else:
+        search = lambda topics: {topic: get_jira_issues({"topic": topic}) for topic in topics}
+
+    # Topics searched recently (by any run in this process) come from the cache
+    issues = search_topics_cached(topics_list, search)
+
+    # One ticket per cluster of repeated or near-identical issues
+    issues, cluster_sizes = dedupe_issues(issues)
+
+    # Rank locally so the LLM only sees the best candidates, whatever the project size
+    descriptions = None
+    if search_mode == "mirror":
+        descriptions = get_jira_mirror().descriptions(key for topic_issues in issues.values() for key in topic_issues)
+    ranked = rank_issues(issues, topics_list, descriptions)
+    on_progress("issues", {"found": sum(cluster_sizes.get(doc["key"], 1) for doc in ranked), "candidates": len(ranked)})
+    if is_decisive(ranked):
+        return [issue["summary"] for issue in ranked[:FINAL_ISSUES]]
+
+    if filter_mode == "map_reduce":
+        candidates = top_candidates(ranked, MAP_REDUCE_TOP_K, cluster_sizes)
+        return agent.filter_issues_map_reduce(candidates, topics_list)
+
+    filter_issues_prompt = agent.filter_issues_prompt(top_candidates(ranked, cluster_sizes=cluster_sizes), topics_list)
     filter_issues_response = agent.invoke(filter_issues_prompt, "You are a helpful assistant that filters issues based on a topic.")
     filtered_issues = extract_json_from_response(filter_issues_response)["issues"]
 
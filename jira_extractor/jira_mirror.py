@@ -0,0 +1,277 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+from jira_extractor.jira_client import iter_jira_issues
+
+logger = logging.getLogger("jira_mirror")
+
+# Comma separated project keys mirrored locally
+JIRA_PROJECTS = [p.strip() for p in os.getenv("JIRA_PROJECTS", "SCRUM").split(",") if p.strip()]
+MIRROR_PATH = os.getenv("JIRA_MIRROR_PATH", "./jira_mirror.db")
+
+# Deleted issues never show up in `updated >=` queries, the key list is
+# compared against Jira once in a while instead
+RECONCILE_INTERVAL = int(os.getenv("JIRA_MIRROR_RECONCILE_SECONDS", str(24 * 3600)))
+
+# Seconds after a sync before a search starts another one in the background
+SYNC_INTERVAL = int(os.getenv("JIRA_MIRROR_SYNC_SECONDS", "60"))
+
+SYNC_PAGE_SIZE = 100
+SYNC_FIELDS = ("summary", "description", "labels", "created", "updated")
+
+# JQL dates have minute resolution, re-read the last minute on every sync
+SYNC_OVERLAP = timedelta(minutes=1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    project TEXT NOT NULL,
+    summary TEXT,
+    description TEXT,
+    labels TEXT,
+    created TEXT,
+    updated TEXT
+);
+CREATE INDEX IF NOT EXISTS issues_project ON issues(project);
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+    summary, description, labels,
+    content='issues', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS issues_ai AFTER INSERT ON issues BEGIN
+    INSERT INTO issues_fts(rowid, summary, description, labels)
+    VALUES (new.id, new.summary, new.description, new.labels);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_ad AFTER DELETE ON issues BEGIN
+    INSERT INTO issues_fts(issues_fts, rowid, summary, description, labels)
+    VALUES ('delete', old.id, old.summary, old.description, old.labels);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_au AFTER UPDATE ON issues BEGIN
+    INSERT INTO issues_fts(issues_fts, rowid, summary, description, labels)
+    VALUES ('delete', old.id, old.summary, old.description, old.labels);
+    INSERT INTO issues_fts(rowid, summary, description, labels)
+    VALUES (new.id, new.summary, new.description, new.labels);
+END;
+CREATE TABLE IF NOT EXISTS sync_state (
+    project TEXT PRIMARY KEY,
+    last_sync TEXT,
+    last_reconcile REAL
+);
+"""
+
+
+def _jql_date(updated: str) -> str:
+    """Jira timestamp (2025-01-01T10:00:00.000+0200) -> JQL date, in the same wall-clock time"""
+    when = datetime.strptime(updated[:16], "%Y-%m-%dT%H:%M") - SYNC_OVERLAP
+    return when.strftime("%Y-%m-%d %H:%M")
+
+
+def _fts_query(topic: str) -> str:
+    """Approximation of `text ~ topic`: every word of the topic, stemmed"""
+    return " AND ".join(f'"{word}"' for word in re.findall(r"\w+", topic.lower()))
+
+
+class JiraMirror:
+    """
+    Local SQLite copy of the Jira projects with an FTS5 index over summary,
+    description and labels.
+
+    sync() pulls only what changed since the previous sync and, every
+    RECONCILE_INTERVAL seconds, drops issues that were deleted in Jira.
+    search() then answers topic searches locally. sync_in_background()
+    refreshes the mirror without making the caller wait for Jira.
+
+    Args:
+        path: SQLite database file
+        projects: Jira project keys to mirror
+    """
+
+    def __init__(self, path: str = MIRROR_PATH, projects: List[str] = None):
+        self.path = path
+        self.projects = projects or JIRA_PROJECTS
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._sync_lock = threading.Lock()
+        self._sync_thread = None
+        self._last_synced = None  # monotonic time the last sync ended
+
+    def close(self):
+        self._db.close()
+
+    def _state(self, project: str):
+        row = self._db.execute(
+            "SELECT last_sync, last_reconcile FROM sync_state WHERE project = ?", (project,)
+        ).fetchone()
+        return row or (None, None)
+
+    def sync(self, reconcile: bool = None) -> dict:
+        """
+        Bring the mirror up to date with Jira.
+
+        Args:
+            reconcile: Force (True) or skip (False) the deleted issues check,
+                by default it runs when RECONCILE_INTERVAL has passed
+
+        Returns:
+            {project: {"updated": n, "deleted": n}}
+        """
+        report = {}
+        for project in self.projects:
+            with self._lock:
+                last_sync, last_reconcile = self._state(project)
+
+            jql = f'project = "{project}"'
+            if last_sync:
+                jql += f' AND updated >= "{_jql_date(last_sync)}"'
+            jql += " ORDER BY updated ASC"
+
+            updated = 0
+            rows = []
+            for issue in iter_jira_issues(jql, fields=SYNC_FIELDS, page_size=SYNC_PAGE_SIZE):
+                rows.append((
+                    int(issue["id"]), issue["key"], project, issue["summary"], issue["description"],
+                    " ".join(issue["labels"] or []), issue["created"], issue["updated"],
+                ))
+                if not last_sync or issue["updated"] > last_sync:
+                    last_sync = issue["updated"]
+                # Commit page by page so an interrupted sync resumes where it stopped
+                if len(rows) >= SYNC_PAGE_SIZE:
+                    self._store(project, rows, last_sync)
+                    updated += len(rows)
+                    rows = []
+            self._store(project, rows, last_sync)
+            updated += len(rows)
+
+            due = last_reconcile is None or time.time() - last_reconcile >= RECONCILE_INTERVAL
+            deleted = self.reconcile(project) if (due if reconcile is None else reconcile) else 0
+            logger.info(f"Synced {project}: {updated} issues updated, {deleted} deleted")
+            report[project] = {"updated": updated, "deleted": deleted}
+        with self._sync_lock:
+            self._last_synced = time.monotonic()
+        return report
+
+    def sync_in_background(self, min_interval: float = SYNC_INTERVAL) -> bool:
+        """
+        Start sync() on a background thread, unless one is running or the
+        last sync ended less than min_interval seconds ago.
+
+        Returns:
+            True if a sync was started
+        """
+        with self._sync_lock:
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return False
+            if self._last_synced is not None and time.monotonic() - self._last_synced < min_interval:
+                return False
+            self._sync_thread = threading.Thread(target=self._background_sync, name="jira-mirror-sync", daemon=True)
+            self._sync_thread.start()
+            return True
+
+    def _background_sync(self):
+        try:
+            self.sync()
+        except Exception as e:
+            logger.warning(f"Background Jira sync failed, the mirror stays as it is: {e}")
+            # A failed sync also waits min_interval, so a throttling Jira isn't hammered
+            with self._sync_lock:
+                self._last_synced = time.monotonic()
+
+    def _store(self, project: str, rows: list, last_sync: str):
+        with self._lock, self._db:
+            self._db.executemany(
+                """INSERT INTO issues (id, key, project, summary, description, labels, created, updated)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       key = excluded.key, project = excluded.project, summary = excluded.summary,
+                       description = excluded.description, labels = excluded.labels,
+                       created = excluded.created, updated = excluded.updated""",
+                rows
+            )
+            if last_sync:
+                self._db.execute(
+                    """INSERT INTO sync_state (project, last_sync) VALUES (?, ?)
+                       ON CONFLICT(project) DO UPDATE SET last_sync = excluded.last_sync""",
+                    (project, last_sync)
+                )
+
+    def reconcile(self, project: str) -> int:
+        """
+        Delete local issues of the project that no longer exist in Jira.
+
+        Returns:
+            Number of issues deleted
+        """
+        # Only the ids are needed, project the smallest field there is
+        remote = {
+            int(issue["id"])
+            for issue in iter_jira_issues(f'project = "{project}"', fields=("updated",), page_size=SYNC_PAGE_SIZE)
+        }
+
+        with self._lock, self._db:
+            local = {row[0] for row in self._db.execute("SELECT id FROM issues WHERE project = ?", (project,))}
+            gone = local - remote
+            self._db.executemany("DELETE FROM issues WHERE id = ?", [(issue_id,) for issue_id in gone])
+            self._db.execute(
+                """INSERT INTO sync_state (project, last_reconcile) VALUES (?, ?)
+                   ON CONFLICT(project) DO UPDATE SET last_reconcile = excluded.last_reconcile""",
+                (project, time.time())
+            )
+        return len(gone)
+
+    def search(self, topic: str, limit: int = 50) -> Dict[str, str]:
+        """
+        Return {issue_key: summary} for mirrored issues matching the topic,
+        newest first, like get_jira_issues does against Jira.
+        """
+        query = _fts_query(topic)
+        if not query:
+            return {}
+        with self._lock:
+            rows = self._db.execute(
+                """SELECT issues.key, issues.summary FROM issues_fts
+                   JOIN issues ON issues.id = issues_fts.rowid
+                   WHERE issues_fts MATCH ?
+                   ORDER BY issues.created DESC
+                   LIMIT ?""",
+                (query, limit)
+            ).fetchall()
+        return dict(rows)
+
+    def descriptions(self, keys: List[str]) -> Dict[str, str]:
+        """{issue_key: description} of the mirrored issues among the keys"""
+        keys = list(keys)
+        result = {}
+        with self._lock:
+            # Stay below SQLite's bound parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                result.update(self._db.execute(
+                    f"SELECT key, description FROM issues WHERE key IN ({placeholders}) AND description IS NOT NULL",
+                    chunk
+                ).fetchall())
+        return result
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
+
+
+_mirror = None
+_mirror_lock = threading.Lock()
+
+
+def get_jira_mirror() -> JiraMirror:
+    """Return the process-wide mirror, opening the database on first use"""
+    global _mirror
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = JiraMirror()
+    return _mirror
@@ -0,0 +1,124 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from jira_extractor.issue_ranker import stem
+from utils import TECH_WORD_PATTERN
+
+logger = logging.getLogger("topic_cache")
+
+# Seconds a cached topic search stays valid
+CACHE_TTL = float(os.getenv("JIRA_TOPIC_CACHE_TTL", "900"))
+
+# Topics kept, least recently used ones are evicted first
+CACHE_MAX_ENTRIES = int(os.getenv("JIRA_TOPIC_CACHE_SIZE", "512"))
+
+# Spellings of the same topic, mapped to one word before stemming
+SYNONYMS = {
+    "auth": "authentication",
+    "authn": "authentication",
+    "signin": "login",
+    "logon": "login",
+    "register": "signup",
+    "registration": "signup",
+    "db": "database",
+    "sql": "database",
+    "k8s": "kubernetes",
+    "rest": "api",
+    "ui": "frontend",
+    "cicd": "pipeline",
+    "ci": "pipeline",
+    "cd": "pipeline",
+    "docs": "documentation",
+    "test": "tests",
+    "testing": "tests",
+    "perf": "performance",
+}
+
+
+def normalize_topic(topic: str) -> str:
+    """
+    Cache key of a topic: case-folded, synonyms collapsed, stemmed, word order
+    ignored. "+", "#" and "." stay in the words, so "C++", "C#" and "C" get
+    different keys; a topic without any word gets the empty key.
+    """
+    words = (topic or "").casefold().replace("/", "").split()
+    words = [SYNONYMS.get(word, word) for word in words]
+    tokens = TECH_WORD_PATTERN.findall(" ".join(words))
+    # Only plain words are stemmed, "node.js" is not a plural of "node.j"
+    return " ".join(sorted({stem(token) if token.isalnum() else token for token in tokens}))
+
+
+class TopicSearchCache:
+    """
+    TTL + LRU cache of topic search results ({issue_key: summary}) keyed by
+    the normalized topic, shared by every search mode of the extractor.
+
+    Args:
+        ttl: Seconds an entry stays valid
+        max_entries: Entries kept before the least recently used is evicted
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # normalized topic -> (expiry, issues)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, topic: str) -> Optional[Dict[str, str]]:
+        """Cached issues of the topic, or None (always for topics without a key)"""
+        key = normalize_topic(topic)
+        if not key:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return dict(entry[1])
+
+    def put(self, topic: str, issues: Dict[str, str]):
+        key = normalize_topic(topic)
+        if not key:
+            # Punctuation-only topics would all share the empty key
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, dict(issues))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, topic: str = None):
+        """
+        Drop the cached searches of one topic, or all of them (e.g. after
+        issues were created in Jira)
+        """
+        with self._lock:
+            if topic is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(normalize_topic(topic), None)
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return dict(
+                self._stats,
+                entries=len(self._entries),
+                hit_rate=self._stats["hits"] / lookups if lookups else 0.0
+            )
+
+
+# Process-wide cache, so back-to-back workflow runs in the server share it
+topic_cache = TopicSearchCache()
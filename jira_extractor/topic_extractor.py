@@ -0,0 +1,128 @@
+import functools
+import json
+import logging
+import os
+import re
+from typing import List, Tuple
+from jira_extractor.topic_cache import SYNONYMS, normalize_topic
+from utils import TECH_WORD_PATTERN
+
+logger = logging.getLogger("topic_extractor")
+
+# Labels, components, tech stack and team skills of the mock Jira export
+VOCABULARY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "managerPrompt_taskGenerate_Agents", "mock_data", "jira_tasks.json"
+)
+
+# Below this confidence the description is treated as prose and the LLM extracts the topics
+CONFIDENCE_THRESHOLD = 0.6
+
+# Segments longer than this many words read like sentences, not keyword lists
+MAX_KEYWORD_SEGMENT_WORDS = 5
+
+# Words that say what kind of work it is, not what it is about
+GENERIC_WORDS = {
+    "a", "an", "and", "or", "the", "of", "for", "with", "to", "in", "on", "using", "via",
+    "development", "design", "integration", "implementation", "page", "pages", "system",
+    "systems", "support", "functionality", "management", "optimization", "service", "services",
+}
+
+# Words that only show up in sentences
+PROSE_WORDS = {
+    "we", "i", "you", "they", "our", "need", "needs", "should", "must", "will", "would",
+    "want", "looking", "able", "candidate", "is", "are", "be", "who", "that", "which",
+}
+
+# Imperatives that lead task sentences ("build a REST API with Flask"), never topics
+ACTION_WORDS = {
+    "build", "add", "deploy", "create", "implement", "make", "fix", "set", "use", "write",
+    "develop", "configure", "integrate", "migrate", "refactor", "improve", "update", "extend",
+    "handle", "ensure", "provide", "allow", "enable", "run", "setup",
+}
+
+_SEGMENT_PATTERN = re.compile(r"[,;\n]+|\.\s+")
+
+
+@functools.lru_cache(maxsize=1)
+def load_vocabulary(path: str = VOCABULARY_PATH) -> dict:
+    """
+    Skills vocabulary: normalized topic -> canonical spelling, from the
+    labels, components, tech stack and team skills of the mock Jira tasks
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load the topic vocabulary from {path}: {e}")
+        data = {}
+
+    # When several terms normalize alike the earlier group names the topic:
+    # Jira labels/components, their parts, the synonym targets, the tech stack
+    labels = set()
+    parts = set()
+    for task in data.get("tasks", []):
+        labels.update(task.get("labels", []))
+        for component in task.get("components", []):
+            labels.add(component)
+            # "user-service" is also about "user"
+            parts.update(part for part in component.split("-") if part not in GENERIC_WORDS)
+    stack = set()
+    for group in ("tech_stack", "team_skills"):
+        for values in data.get(group, {}).values():
+            stack.update(values)
+
+    vocabulary = {}
+    for terms in (labels, parts, set(SYNONYMS.values()), stack):
+        for term in sorted(term.lower() for term in terms):
+            vocabulary.setdefault(normalize_topic(term.replace("-", " ")), term)
+    return vocabulary
+
+
+def extract_topics(tasks_description_json: dict) -> Tuple[List[str], float]:
+    """
+    Extract Jira search topics from a tasks description without the LLM.
+
+    The description (and the languages) are split on commas, generic words
+    and leading imperatives ("build", "deploy") are dropped, abbreviations are expanded and words of the skills
+    vocabulary are spelled the way the vocabulary spells them.
+
+    Returns:
+        (topics, confidence) where confidence (0-1) says how much the input
+        looks like a keyword list the vocabulary understands; prose scores low
+    """
+    text = ", ".join(
+        str(tasks_description_json.get(field) or "")
+        for field in ("tasks_description", "language")
+    )
+    segments = [segment.strip() for segment in _SEGMENT_PATTERN.split(text.lower()) if segment.strip()]
+    if not segments:
+        return [], 0.0
+
+    vocabulary = load_vocabulary()
+    topics = {}
+    keyword_segments = 0
+    known_segments = 0
+    for segment in segments:
+        words = TECH_WORD_PATTERN.findall(segment.replace("/", "").replace("-", " "))
+        # Keyword lists name things, sentences start with what to do
+        if (len(words) <= MAX_KEYWORD_SEGMENT_WORDS and not PROSE_WORDS.intersection(words)
+                and not (words and words[0] in ACTION_WORDS)):
+            keyword_segments += 1
+
+        known = False
+        for word in words:
+            if word in GENERIC_WORDS or word in PROSE_WORDS or word in ACTION_WORDS:
+                continue
+            word = SYNONYMS.get(word, word)
+            key = normalize_topic(word)
+            if not key:
+                continue
+            if key in vocabulary:
+                known = True
+                word = vocabulary[key]
+            topics.setdefault(key, word)
+        known_segments += known
+
+    confidence = 0.7 * keyword_segments / len(segments) + 0.3 * known_segments / len(segments)
+    return list(topics.values()), confidence
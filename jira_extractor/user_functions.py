@@ -1,28 +1,38 @@
-from jira import JIRA
 import os
-from dotenv import load_dotenv
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+from jira_extractor.jira_client import iter_jira_issues
+from jira_extractor.jira_mirror import get_jira_mirror
+from jira_extractor.topic_cache import TopicSearchCache, normalize_topic, topic_cache
 
-load_dotenv()
+# Jira rejects very long JQL strings, stay well below the limit
+MAX_JQL_LENGTH = 2000
+
+# Issues kept per topic, same as a single-topic search_issues page
+MAX_RESULTS_PER_TOPIC = 50
+
+# Topic searches running at once in get_jira_issues_concurrent
+MAX_CONCURRENT_SEARCHES = 8
 
 def get_jira_issues(query: dict) -> dict:
     """
     Return {issue_key: summary} for issues whose text contains the given topic.
-    """
-    jira = JIRA(
-        server="https://generated-interview-task.atlassian.net",    # e.g. "https://acme.atlassian.net"
-        basic_auth=(                 # ► store secrets in env‑vars or Config
-            os.getenv("JIRA_EMAIL"),  # or Config.JIRA_EMAIL
-            os.getenv("JIRA_API_TOKEN"),
-        ),
-    )
 
+    query["max_results"] caps the number of issues (default MAX_RESULTS_PER_TOPIC),
+    they are streamed page by page with only the summary field.
+    """
     topic = query.get("topic")
     if not topic:
         return {}
 
     # Build a proper JQL clause; quote the phrase so spaces are allowed
     jql = f'text ~ "{topic}" ORDER BY created DESC'
-    issues = jira.search_issues(jql)
+    max_results = query.get("max_results", MAX_RESULTS_PER_TOPIC)
+    issues = {
+        issue["key"]: issue["summary"]
+        for issue in iter_jira_issues(jql, fields=("summary",), max_issues=max_results)
+    }
 
     # jql = "SCRUM-1"
     # issues = jira.issue(jql)
@@ -32,7 +42,167 @@ def get_jira_issues(query: dict) -> dict:
     print('issues:')
     print(issues)
 
-    return {i.key: i.fields.summary for i in issues}
+    return issues
+
+def _quote(topic: str) -> str:
+    return '"' + topic.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def group_topics_for_jql(topics: List[str], max_length: int = MAX_JQL_LENGTH) -> List[List[str]]:
+    """
+    Split topics into groups whose OR-ed `text ~` clauses fit in one JQL query.
+
+    Returns:
+        List of topic groups, one JQL query per group
+    """
+    suffix = " ORDER BY created DESC"
+    groups, current, length = [], [], len(suffix)
+    for topic in topics:
+        clause = f"text ~ {_quote(topic)}"
+        extra = len(clause) + (4 if current else 0)  # " OR "
+        if current and length + extra > max_length:
+            groups.append(current)
+            current, length = [], len(suffix)
+            extra = len(clause)
+        current.append(topic)
+        length += extra
+    if current:
+        groups.append(current)
+    return groups
+
+def _topic_matcher(topic: str):
+    """Local approximation of `text ~ topic`: every word of the topic appears in the text"""
+    words = re.findall(r"\w+", topic.lower())
+    # Jira stems words, so also accept a shared prefix for longer words
+    stems = [w[:max(4, len(w) - 3)] if len(w) > 5 else w for w in words]
+    return lambda text: bool(words) and all(stem in text for stem in stems)
+
+def get_jira_issues_batched(topics: List[str], max_length: int = MAX_JQL_LENGTH,
+                            max_results_per_topic: int = MAX_RESULTS_PER_TOPIC,
+                            page_size: int = 100, max_pages: int = 2) -> Dict[str, dict]:
+    """
+    Search all topics with as few JQL queries as the length limit allows.
+
+    The topics are OR-ed into combined `text ~` queries and every returned
+    issue is attributed back to the topics it matches, locally, using its
+    summary, description and labels. Each combined query is paged (newest
+    first) until every topic has its `max_results_per_topic` most recent
+    issues, the results run out, or `max_pages` pages were read; in the
+    last case rare topics can end up with fewer issues than a dedicated
+    query would return.
+
+    Returns:
+        {topic: {issue_key: summary}}, the same dict as calling
+        get_jira_issues once per topic
+    """
+    topics = [topic for topic in dict.fromkeys(topics) if topic]
+    results = {topic: {} for topic in topics}
+    if not topics:
+        return results
+
+    matchers = {topic: _topic_matcher(topic) for topic in topics}
+
+    for group in group_topics_for_jql(topics, max_length):
+        clauses = " OR ".join(f"text ~ {_quote(topic)}" for topic in group)
+        jql = f"{clauses} ORDER BY created DESC"
+
+        issues = iter_jira_issues(
+            jql,
+            fields=("summary", "description", "labels"),
+            page_size=page_size,
+            max_issues=page_size * max_pages
+        )
+        for issue in issues:
+            text = " ".join([
+                issue["summary"] or "",
+                issue["description"] or "",
+                " ".join(issue["labels"] or []),
+            ]).lower()
+            for topic in group:
+                if len(results[topic]) < max_results_per_topic and matchers[topic](text):
+                    results[topic][issue["key"]] = issue["summary"]
+            if all(len(results[topic]) >= max_results_per_topic for topic in group):
+                break
+
+    return results
+
+def get_jira_issues_concurrent(topics: List[str], max_workers: int = MAX_CONCURRENT_SEARCHES) -> Dict[str, dict]:
+    """
+    Run one get_jira_issues search per topic on a bounded thread pool.
+
+    Returns:
+        {topic: {issue_key: summary}} with the topics in their input order
+    """
+    topics = [topic for topic in dict.fromkeys(topics) if topic]
+    if not topics:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(topics))) as pool:
+        # map() yields in submission order, whatever order the searches finish in
+        results = pool.map(lambda topic: get_jira_issues({"topic": topic}), topics)
+        return dict(zip(topics, results))
+
+def get_jira_issues_from_mirror(topics: List[str], max_results_per_topic: int = MAX_RESULTS_PER_TOPIC) -> Dict[str, dict]:
+    """
+    Search the topics in the local Jira mirror.
+
+    The mirror is searched as it is while an incremental sync runs in the
+    background (at most every SYNC_INTERVAL seconds), so a slow or
+    throttling Jira never holds up the search. Only a mirror that was never
+    synced waits for the first sync.
+
+    Returns:
+        {topic: {issue_key: summary}} with the topics in their input order
+    """
+    mirror = get_jira_mirror()
+    if mirror.count():
+        mirror.sync_in_background()
+    else:
+        mirror.sync()
+
+    topics = [topic for topic in dict.fromkeys(topics) if topic]
+    return {topic: mirror.search(topic, max_results_per_topic) for topic in topics}
+
+def search_topics_cached(topics: List[str], search: Callable[[List[str]], Dict[str, dict]],
+                         cache: TopicSearchCache = topic_cache) -> Dict[str, dict]:
+    """
+    Answer topic searches from the topic cache and run `search` only for the
+    topics that aren't cached (or expired). Topics that normalize to the same
+    key ("auth", "Authentication") are searched once.
+
+    Args:
+        topics: Topics to search
+        search: One of the get_jira_issues_* functions taking a topic list
+
+    Returns:
+        {topic: {issue_key: summary}} with the topics in their input order
+    """
+    topics = [topic for topic in dict.fromkeys(topics) if topic]
+    # Topics without any word ("!!!") have no cache key and match nothing useful
+    skipped = [topic for topic in topics if not normalize_topic(topic)]
+    if skipped:
+        print(f"Skipping topics without words: {skipped}")
+        topics = [topic for topic in topics if normalize_topic(topic)]
+    results = {}
+    missing = {}
+    cached_count = 0
+    for topic in topics:
+        cached = cache.get(topic)
+        if cached is not None:
+            results[topic] = cached
+            cached_count += 1
+        else:
+            missing.setdefault(normalize_topic(topic), []).append(topic)
+
+    if missing:
+        found = search([group[0] for group in missing.values()])
+        for group in missing.values():
+            issues = found.get(group[0], {})
+            cache.put(group[0], issues)
+            for topic in group:
+                results[topic] = dict(issues)
+
+    print(f"Topic cache: {cached_count} of {len(topics)} topics cached, {cache.stats()}")
+    return {topic: results[topic] for topic in topics}
 
 def clone_github_repo(repo_url: str, clone_dir: str = "./cloned_repo"):
     if not shutil.which("git"):
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for LLM chat completions.
+
+A completion is stored under the SHA-256 of the endpoint, deployment,
+messages, sampling parameters and response_format of the request, so a
+byte-identical request is answered from disk without calling Azure.
+
+The cache is opt-in (LLM_CACHE_DIR) and only stores deterministic requests
+(temperature 0) unless forced, per call or with LLM_CACHE_FORCE=1 for
+development and regression runs, where reusing a sampled answer is wanted.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from openai.types.chat import ChatCompletion
+
+logger = logging.getLogger("llm_cache")
+
+CACHE_DIR = os.getenv("LLM_CACHE_DIR")
+CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024
+CACHE_FORCE = os.getenv("LLM_CACHE_FORCE", "").lower() in ("1", "true", "yes")
+
+# Request arguments that change the completion, everything else (timeouts,
+# extra headers...) is left out of the key
+KEY_ARGUMENTS = (
+    "model", "messages", "temperature", "top_p", "frequency_penalty", "presence_penalty",
+    "max_completion_tokens", "max_tokens", "n", "stop", "seed", "response_format",
+    "tools", "tool_choice", "logit_bias",
+)
+
+
+def cache_key(endpoint: str, request: Dict[str, Any]) -> str:
+    """SHA-256 of the endpoint and the completion-relevant request arguments"""
+    material = {"endpoint": endpoint}
+    material.update({name: request[name] for name in KEY_ARGUMENTS if name in request})
+    canonical = json.dumps(material, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_deterministic(request: Dict[str, Any]) -> bool:
+    """Only greedy sampling gives the same answer again (the API default temperature is 1)"""
+    return request.get("temperature", 1.0) == 0
+
+
+class CompletionCache:
+    """
+    Completions stored as JSON files under directory/<key[:2]>/<key>.json,
+    evicting the least recently used files once max_bytes is exceeded.
+
+    Args:
+        directory: Cache directory, created if missing
+        max_bytes: Size bound of the stored completions
+        force: Also cache non-deterministic requests
+    """
+
+    def __init__(self, directory: str, max_bytes: int = CACHE_MAX_BYTES, force: bool = CACHE_FORCE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.force = force
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "bypassed": 0,
+                       "refused": 0, "evictions": 0, "bytes": 0}
+        os.makedirs(directory, exist_ok=True)
+        self._stats["bytes"] = sum(size for _, size, _ in self._files())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _files(self):
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def _cacheable(self, request: Dict[str, Any], cache) -> bool:
+        if cache is False:
+            with self._lock:
+                self._stats["bypassed"] += 1
+            return False
+        if cache == "force" or self.force or is_deterministic(request):
+            return True
+        with self._lock:
+            self._stats["refused"] += 1
+        return False
+
+    def get(self, endpoint: str, request: Dict[str, Any], cache=True) -> Optional[ChatCompletion]:
+        """
+        Cached completion of the request, or None.
+
+        Args:
+            cache: True to use the cache for deterministic requests, False to
+                bypass it, "force" to use it for non-deterministic ones too
+        """
+        if not self._cacheable(request, cache):
+            return None
+        path = self._path(cache_key(endpoint, request))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                completion = ChatCompletion.model_validate_json(f.read())
+            # mtime is the recency used for eviction
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        with self._lock:
+            self._stats["hits"] += 1
+        return completion
+
+    def put(self, endpoint: str, request: Dict[str, Any], completion: ChatCompletion, cache=True):
+        """Store the completion of a cacheable request (same cache argument as get)"""
+        if cache is False or not (cache == "force" or self.force or is_deterministic(request)):
+            return
+        path = self._path(cache_key(endpoint, request))
+        data = completion.model_dump_json().encode("utf-8")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+        with self._lock:
+            # An overwritten completion no longer counts towards the size
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(temporary, path)
+            self._stats["stores"] += 1
+            self._stats["bytes"] += len(data) - replaced
+            over = self._stats["bytes"] > self.max_bytes
+        if over:
+            self._evict()
+
+    def _evict(self):
+        with self._lock:
+            files = sorted(self._files(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in files)
+            # Down to 90% so eviction doesn't run on every store
+            target = self.max_bytes * 0.9
+            for path, size, _ in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self._stats["evictions"] += 1
+            self._stats["bytes"] = total
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return dict(self._stats, hit_rate=self._stats["hits"] / lookups if lookups else 0.0)
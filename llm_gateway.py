@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Shared LLM client layer for the agents.
+
+Every Azure OpenAI endpoint gets one AsyncAzureOpenAI client with a pooled,
+keep-alive HTTP connection pool, created on first use (importing this module
+doesn't create clients or open connections). The clients live on one
+background event loop, so they can be used from synchronous code (complete)
+and from any asyncio event loop (acomplete) without blocking it.
+
+Usage:
+    from llm_gateway import complete, acomplete
+
+    response = complete("task_generate", model="taskCreator", messages=[...])
+    response = await acomplete("jira_extractor", model="gpt-4.1", messages=[...])
+    for delta in stream("task_generate", model="taskCreator", messages=[...]): ...
+
+Prompt, cached prompt and completion tokens of every call are logged and
+added up per endpoint (usage_stats), to check that stable prompt prefixes
+hit the provider's prompt cache.
+
+With LLM_CACHE_DIR set, completions are also answered from the on-disk
+cache in llm_cache (pass cache=False to bypass it, cache="force" to cache a
+sampled completion).
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+
+# Before llm_cache, which reads LLM_CACHE_DIR and its limits at import
+load_dotenv()
+
+from llm_cache import CACHE_DIR, CompletionCache
+
+logger = logging.getLogger("llm_gateway")
+
+DEFAULT_API_VERSION = "2024-12-01-preview"
+
+# Keep-alive connections per endpoint
+POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+
+# Endpoints by name: a fixed URL or the environment variable holding it,
+# and the environment variable holding the API key
+ENDPOINTS = {
+    "jira_extractor": {
+        "endpoint": "https://ai-dentzbar2802ai654595622363.openai.azure.com/",
+        "api_key_env": "AZURE_OPENAI_API_KEY_JIRA_EXT",
+    },
+    "task_generate": {
+        "endpoint_env": "AZURE_OPENAI_ENDPOINT_TASK_GEN",
+        "api_key_env": "AZURE_OPENAI_KEY_TASK_GEN",
+    },
+}
+
+
+class LLMGateway:
+    """
+    Lazily created, pooled async clients per endpoint, driven by a private
+    event loop running in a daemon thread.
+    """
+
+    def __init__(self, endpoints: Dict[str, Dict[str, str]] = None, cache: CompletionCache = None):
+        self.endpoints = endpoints or ENDPOINTS
+        self.cache = cache
+        self._clients = {}
+        self._loop = None
+        self._lock = threading.Lock()
+        self._usage = {}  # endpoint -> token and latency totals
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _client(self, name: str) -> AsyncAzureOpenAI:
+        # Only called on the gateway loop, no locking needed
+        client = self._clients.get(name)
+        if client is None:
+            if name not in self.endpoints:
+                raise ValueError(f"Unknown LLM endpoint: {name}")
+            config = self.endpoints[name]
+            endpoint = config.get("endpoint") or os.getenv(config.get("endpoint_env", ""))
+            client = AsyncAzureOpenAI(
+                api_key=os.getenv(config["api_key_env"]),
+                api_version=config.get("api_version", DEFAULT_API_VERSION),
+                azure_endpoint=endpoint,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE)
+                ),
+            )
+            self._clients[name] = client
+            logger.info(f"Created LLM client for {name} ({endpoint})")
+        return client
+
+    async def _create(self, name: str, kwargs: Dict[str, Any]):
+        started = time.monotonic()
+        response = await self._client(name).chat.completions.create(**kwargs)
+        self._record_usage(name, response.usage, time.monotonic() - started)
+        return response
+
+    def _record_usage(self, name: str, usage, seconds: float, first_token: float = None):
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or 0
+        timing = f"{seconds:.2f}s" if first_token is None else f"first token {first_token:.2f}s, {seconds:.2f}s"
+        logger.info(
+            f"{name}: {usage.prompt_tokens} prompt tokens ({cached} cached), "
+            f"{usage.completion_tokens} completion tokens, {timing}"
+        )
+        with self._lock:
+            totals = self._usage.setdefault(name, {
+                "calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "seconds": 0.0
+            })
+            totals["calls"] += 1
+            totals["prompt_tokens"] += usage.prompt_tokens
+            totals["cached_tokens"] += cached
+            totals["completion_tokens"] += usage.completion_tokens
+            totals["seconds"] += seconds
+
+    def usage_stats(self) -> Dict[str, dict]:
+        """Token and latency totals per endpoint, with the share of prompt tokens served from the prompt cache"""
+        with self._lock:
+            return {
+                name: dict(totals, cached_rate=totals["cached_tokens"] / totals["prompt_tokens"] if totals["prompt_tokens"] else 0.0)
+                for name, totals in self._usage.items()
+            }
+
+    def complete(self, name: str, cache=True, **kwargs):
+        """
+        Chat completion on the named endpoint, blocking the calling thread.
+        Must not be called from the gateway's own loop.
+
+        Args:
+            name: Endpoint name from ENDPOINTS
+            cache: Completion cache use, see CompletionCache.get
+            **kwargs: chat.completions.create arguments (model, messages, ...)
+        """
+        if self.cache is not None:
+            cached = self.cache.get(name, kwargs, cache)
+            if cached is not None:
+                return cached
+        future = asyncio.run_coroutine_threadsafe(self._create(name, kwargs), self._ensure_loop())
+        response = future.result()
+        if self.cache is not None:
+            self.cache.put(name, kwargs, response, cache)
+        return response
+
+    async def acomplete(self, name: str, cache=True, **kwargs):
+        """Chat completion on the named endpoint, awaitable from any event loop"""
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, name, kwargs, cache)
+            if cached is not None:
+                return cached
+        future = asyncio.run_coroutine_threadsafe(self._create(name, kwargs), self._ensure_loop())
+        response = await asyncio.wrap_future(future)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, name, kwargs, response, cache)
+        return response
+
+    async def _stream(self, name: str, kwargs: Dict[str, Any], emit):
+        try:
+            started = time.monotonic()
+            first_token = None
+            usage = None
+            kwargs.setdefault("stream_options", {"include_usage": True})
+            stream = await self._client(name).chat.completions.create(stream=True, **kwargs)
+            async for chunk in stream:
+                # Usage comes in a last chunk without choices, and Azure sends
+                # content filter results in chunks without choices
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if first_token is None:
+                        first_token = time.monotonic() - started
+                    emit(chunk.choices[0].delta.content)
+            self._record_usage(name, usage, time.monotonic() - started, first_token)
+            emit(None)
+        except Exception as e:
+            emit(e)
+
+    def stream(self, name: str, **kwargs) -> Iterator[str]:
+        """
+        Stream a chat completion on the named endpoint, yielding the content
+        deltas as they arrive. Streamed completions are not cached.
+        """
+        deltas = queue.Queue()
+        asyncio.run_coroutine_threadsafe(self._stream(name, kwargs, deltas.put), self._ensure_loop())
+        while True:
+            delta = deltas.get()
+            if delta is None:
+                return
+            if isinstance(delta, Exception):
+                raise delta
+            yield delta
+
+    async def astream(self, name: str, **kwargs) -> AsyncIterator[str]:
+        """stream() for asyncio callers, from any event loop"""
+        loop = asyncio.get_running_loop()
+        deltas = asyncio.Queue()
+        emit = lambda delta: loop.call_soon_threadsafe(deltas.put_nowait, delta)
+        asyncio.run_coroutine_threadsafe(self._stream(name, kwargs, emit), self._ensure_loop())
+        while True:
+            delta = await deltas.get()
+            if delta is None:
+                return
+            if isinstance(delta, Exception):
+                raise delta
+            yield delta
+
+    def run(self, coroutine):
+        """
+        Run a coroutine on the gateway loop and block until it is done, for
+        sync code whose caller may itself be running an event loop (where
+        asyncio.run() fails). Must not be called from the gateway's own loop.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop()).result()
+
+    def close(self):
+        """Close the clients and stop the gateway loop"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        async def close_clients():
+            for client in self._clients.values():
+                await client.close()
+            self._clients.clear()
+
+        asyncio.run_coroutine_threadsafe(close_clients(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_gateway = LLMGateway(cache=CompletionCache(CACHE_DIR) if CACHE_DIR else None)
+
+
+def complete(name: str, cache=True, **kwargs):
+    """Chat completion on the named endpoint of the shared gateway (sync)"""
+    return _gateway.complete(name, cache=cache, **kwargs)
+
+
+async def acomplete(name: str, cache=True, **kwargs):
+    """Chat completion on the named endpoint of the shared gateway (async)"""
+    return await _gateway.acomplete(name, cache=cache, **kwargs)
+
+
+def stream(name: str, **kwargs) -> Iterator[str]:
+    """Streamed chat completion deltas on the named endpoint of the shared gateway (sync)"""
+    return _gateway.stream(name, **kwargs)
+
+
+def astream(name: str, **kwargs) -> AsyncIterator[str]:
+    """Streamed chat completion deltas on the named endpoint of the shared gateway (async)"""
+    return _gateway.astream(name, **kwargs)
+
+
+def run(coroutine):
+    """Run a coroutine on the shared gateway loop, blocking the calling thread"""
+    return _gateway.run(coroutine)
+
+
+def get_llm_gateway() -> LLMGateway:
+    return _gateway
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Local code search over repositories cloned by GitHubCloneAgent.
+
+GitHub code search is slow, tightly rate limited and only indexes the default
+branch. For repositories that already exist under the clone base directory
+the same query can be answered from a local index of the clone at its
+checked-out ref. LocalCodeRouter finds the clone for a query and returns a
+result shaped like the GitHub code search response, so GitHubMCPClient can
+use it transparently and only go to MCP for repositories we haven't cloned.
+"""
+
+import json
+import logging
+import os
+import re
+import shlex
+import subprocess
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from mcp import types
+
+logger = logging.getLogger("local_code_index")
+
+# Same base directory GitHubCloneAgent clones into (github_agent.CONFIG)
+DEFAULT_CLONE_BASE_DIR = "./cloned_repos"
+
+# Files larger than this are not indexed, like GitHub code search
+MAX_INDEXED_FILE_SIZE = 384 * 1024
+
+# Qualifiers that can be answered locally, anything else goes to GitHub
+SUPPORTED_QUALIFIERS = {"repo", "filename", "extension", "path"}
+
+# Seconds a scan of the clone base directory is reused while the directory
+# is unchanged (a remote changed inside an existing clone doesn't touch it)
+CLONE_SCAN_INTERVAL = 30.0
+
+# Boolean operators of GitHub code search, only plain conjunctions are answered locally
+BOOLEAN_OPERATORS = {"AND", "OR", "NOT"}
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_REMOTE_PATTERN = re.compile(r"github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?/?$")
+
+
+def _git(repo_dir: str, *args, input_data: bytes = None) -> bytes:
+    return subprocess.run(
+        ["git", "-C", repo_dir, *args],
+        input=input_data,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    ).stdout
+
+
+def parse_query(query: str) -> Dict[str, Any]:
+    """
+    Split a GitHub code search query into free-text terms and qualifiers.
+
+    Returns:
+        Dictionary with "terms" (list of lowercase strings), "qualifiers"
+        (dict of qualifier name -> list of values) and "boolean" (True if
+        the query uses AND/OR/NOT, negation or parentheses)
+    """
+    try:
+        tokens = shlex.split(query)
+    except ValueError:
+        tokens = query.split()
+
+    terms = []
+    qualifiers = {}
+    boolean = False
+    for token in tokens:
+        if token in BOOLEAN_OPERATORS or token.startswith("-") or "(" in token or ")" in token:
+            boolean = True
+            continue
+        name, sep, value = token.partition(":")
+        if sep and name.isalpha() and value:
+            qualifiers.setdefault(name.lower(), []).append(value)
+        else:
+            terms.append(token.lower())
+    return {"terms": terms, "qualifiers": qualifiers, "boolean": boolean}
+
+
+class LocalCodeIndex:
+    """
+    In-memory inverted index of one clone at its checked-out commit.
+
+    File contents are read from the commit (not the working tree) with
+    `git ls-tree` and `git cat-file --batch`, and the index is rebuilt
+    whenever HEAD moves.
+    """
+
+    def __init__(self, repo_dir: str, full_name: str):
+        self.repo_dir = repo_dir
+        self.full_name = full_name
+        self.commit = None
+        self.files = []        # (path, blob sha, lowercase content)
+        self.postings = {}     # token -> set of file indexes
+        self._lock = threading.Lock()
+
+    def _head(self) -> str:
+        return _git(self.repo_dir, "rev-parse", "HEAD").decode().strip()
+
+    def refresh(self):
+        """Build the index, or rebuild it if the checked-out commit changed"""
+        with self._lock:
+            head = self._head()
+            if head == self.commit:
+                return
+
+            entries = []
+            for line in _git(self.repo_dir, "ls-tree", "-r", "-l", "-z", head).split(b"\0"):
+                if not line:
+                    continue
+                meta, _, path = line.partition(b"\t")
+                _, kind, sha, size = meta.split()
+                if kind == b"blob" and size != b"-" and int(size) <= MAX_INDEXED_FILE_SIZE:
+                    entries.append((path.decode("utf-8", "replace"), sha.decode()))
+
+            contents = self._read_blobs([sha for _, sha in entries])
+
+            files = []
+            postings = {}
+            for (path, sha), data in zip(entries, contents):
+                if b"\0" in data:
+                    continue  # Binary file
+                text = data.decode("utf-8", "replace").lower()
+                index = len(files)
+                files.append((path, sha, text))
+                for token in set(_TOKEN_PATTERN.findall(text)):
+                    postings.setdefault(token, set()).add(index)
+
+            self.files = files
+            self.postings = postings
+            self.commit = head
+            logger.info(f"Indexed {len(files)} files of {self.full_name} at {head[:10]}")
+
+    def _read_blobs(self, shas: List[str]) -> List[bytes]:
+        if not shas:
+            return []
+        output = _git(self.repo_dir, "cat-file", "--batch", input_data="\n".join(shas).encode() + b"\n")
+        blobs = []
+        offset = 0
+        for _ in shas:
+            header_end = output.index(b"\n", offset)
+            size = int(output[offset:header_end].split()[2])
+            start = header_end + 1
+            blobs.append(output[start:start + size])
+            offset = start + size + 1
+        return blobs
+
+    def search(self, terms: List[str], qualifiers: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        """Return the files containing every term and matching the qualifiers"""
+        self.refresh()
+
+        candidates = None
+        for term in terms:
+            for token in _TOKEN_PATTERN.findall(term):
+                matches = self.postings.get(token, set())
+                candidates = matches if candidates is None else candidates & matches
+        if candidates is None:
+            candidates = range(len(self.files))
+
+        filenames = [v.lower() for v in qualifiers.get("filename", [])]
+        extensions = [v.lower().lstrip(".") for v in qualifiers.get("extension", [])]
+        paths = [v.lower().strip("/") for v in qualifiers.get("path", [])]
+
+        owner, _, name = self.full_name.partition("/")
+        items = []
+        for index in sorted(candidates, key=lambda i: self.files[i][0]):
+            path, sha, text = self.files[index]
+            lower_path = path.lower()
+            basename = lower_path.rsplit("/", 1)[-1]
+            if filenames and basename not in filenames:
+                continue
+            if extensions and not any(basename.endswith(f".{ext}") for ext in extensions):
+                continue
+            if paths and not any(lower_path.startswith(p) for p in paths):
+                continue
+            # Postings only narrow the candidates, phrases must appear verbatim
+            if not all(term in text for term in terms):
+                continue
+            items.append({
+                "name": path.rsplit("/", 1)[-1],
+                "path": path,
+                "sha": sha,
+                "url": f"https://api.github.com/repos/{self.full_name}/contents/{path}?ref={self.commit}",
+                "git_url": f"https://api.github.com/repos/{self.full_name}/git/blobs/{sha}",
+                "html_url": f"https://github.com/{self.full_name}/blob/{self.commit}/{path}",
+                "repository": {
+                    "name": name,
+                    "full_name": self.full_name,
+                    "owner": {"login": owner},
+                },
+                "score": 1.0,
+            })
+        return items
+
+
+class LocalCodeRouter:
+    """
+    Answers code searches from local indexes of cloned repositories.
+
+    Args:
+        clone_base_dir: Directory holding the clones, one repository per subdirectory
+    """
+
+    def __init__(self, clone_base_dir: str = DEFAULT_CLONE_BASE_DIR):
+        self.clone_base_dir = clone_base_dir
+        self._clones = {}    # lowercase full name -> (clone directory, full name)
+        self._indexes = {}   # lowercase full name -> LocalCodeIndex
+        self._scanned = None  # (clone base directory mtime, monotonic time) of the last scan
+        self.stats = {"local": 0, "remote": 0}
+
+    def _base_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.clone_base_dir).st_mtime
+        except OSError:
+            return None
+
+    def _scan(self):
+        """Map the origin remotes of the clones to their directories"""
+        self._scanned = (self._base_mtime(), time.monotonic())
+        clones = {}
+        if os.path.isdir(self.clone_base_dir):
+            for entry in os.scandir(self.clone_base_dir):
+                if not os.path.isdir(os.path.join(entry.path, ".git")):
+                    continue
+                try:
+                    remote = _git(entry.path, "remote", "get-url", "origin").decode().strip()
+                except (subprocess.CalledProcessError, OSError):
+                    continue
+                match = _REMOTE_PATTERN.search(remote)
+                if match:
+                    full_name = f"{match.group(1)}/{match.group(2)}"
+                    clones[full_name.lower()] = (entry.path, full_name)
+        self._clones = clones
+
+    def index_for(self, full_name: str) -> Optional[LocalCodeIndex]:
+        """Local index for a repository, or None if it hasn't been cloned"""
+        key = full_name.lower()
+        if key not in self._clones or not os.path.isdir(self._clones[key][0]):
+            # Uncloned repositories are searched often, only rescan (one git call
+            # per clone) when a clone was added or removed, or the scan is old
+            if (self._scanned is None or self._scanned[0] != self._base_mtime()
+                    or time.monotonic() - self._scanned[1] > CLONE_SCAN_INTERVAL):
+                self._scan()
+        if key not in self._clones:
+            return None
+        repo_dir, canonical_name = self._clones[key]
+        index = self._indexes.get(key)
+        if index is None or index.repo_dir != repo_dir:
+            index = self._indexes[key] = LocalCodeIndex(repo_dir, canonical_name)
+        return index
+
+    def search(self, query: str, repo: str = None, filename: str = None, extension: str = None,
+               page: int = 1, per_page: int = 30) -> Optional[Dict[str, Any]]:
+        """
+        Run a code search locally if possible.
+
+        Returns:
+            A GitHub code search shaped result, or None when the query has to
+            go to GitHub (repository not cloned, several or no repositories,
+            boolean operators, negation or qualifiers that can't be
+            evaluated locally)
+        """
+        parsed = parse_query(query)
+        qualifiers = parsed["qualifiers"]
+        repos = qualifiers.pop("repo", [])
+        # in:file is the default scope of a local search
+        if all(value.lower() == "file" for value in qualifiers.get("in", [])):
+            qualifiers.pop("in", None)
+        if repo:
+            repos.append(repo)
+        if filename:
+            qualifiers.setdefault("filename", []).append(filename)
+        if extension:
+            qualifiers.setdefault("extension", []).append(extension)
+
+        if parsed["boolean"] or len({r.lower() for r in repos}) != 1 or set(qualifiers) - SUPPORTED_QUALIFIERS:
+            self.stats["remote"] += 1
+            return None
+
+        index = self.index_for(repos[0])
+        if index is None:
+            self.stats["remote"] += 1
+            return None
+
+        try:
+            items = index.search(parsed["terms"], qualifiers)
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.warning(f"Local code search failed for {repos[0]}, falling back to GitHub: {e}")
+            self.stats["remote"] += 1
+            return None
+
+        self.stats["local"] += 1
+        start = (max(1, page) - 1) * per_page
+        return {
+            "total_count": len(items),
+            "incomplete_results": False,
+            "items": items[start:start + per_page],
+        }
+
+
+def to_call_tool_result(data: Dict[str, Any]) -> types.CallToolResult:
+    """Wrap a local result the way the GitHub MCP server returns it"""
+    return types.CallToolResult(content=[types.TextContent(type="text", text=json.dumps(data))])
@@ -1,3 +1,8 @@
+import os
+import sys
+
+# llm_gateway lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from mcpServer_managerPrompt import generate_manager_prompt_conversation
 
 result = generate_manager_prompt_conversation([
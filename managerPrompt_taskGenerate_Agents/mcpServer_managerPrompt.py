@@ -1,20 +1,11 @@
-import os
 import json
 from dotenv import load_dotenv
-from openai import AzureOpenAI
+from llm_gateway import complete
 
 load_dotenv()
 
-azure_openai_key = os.getenv("AZURE_OPENAI_KEY_TASK_GEN")
-azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT_TASK_GEN")
 deployment_name = "PromptAgent"
 
-client = AzureOpenAI(
-    api_key=azure_openai_key,
-    api_version="2024-12-01-preview",
-    azure_endpoint=azure_endpoint
-)
-
 SYSTEM_PROMPT = """
 You are a warm, friendly assistant helping hiring managers create job requirements for technical assignments. Your goal is to collect key information in just TWO conversation rounds:
 
@@ -100,7 +91,8 @@ Do not ask any more questions. Format your response as a valid JSON object only.
             })
             break
 
-    response = client.chat.completions.create(
+    response = complete(
+        "task_generate",
         model=deployment_name,
         messages=formatted_messages,
         max_completion_tokens=1024,
@@ -1,22 +1,73 @@
 from flask import Flask, request, jsonify
 from dotenv import load_dotenv
-import os
-from openai import AzureOpenAI
+from llm_gateway import complete, stream
+from prompt_budget import fit_to_budget
+from utils import IncrementalJSONObjectParser, shingles
 import json
+import logging
+import time
+from typing import Callable, Iterator, List
 
 load_dotenv()
-azure_openai_key = os.getenv("AZURE_OPENAI_KEY_TASK_GEN")
-azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT_TASK_GEN")
+logger = logging.getLogger("task_generate")
 deployment_name = "taskCreator"
 
-client = AzureOpenAI(
-    api_key=azure_openai_key,
-    api_version="2024-12-01-preview",
-    azure_endpoint=azure_endpoint
-)
+# Variants whose title, description and tasks overlap more than this
+# (Jaccard similarity of character shingles) count as the same assignment
+VARIANT_SIMILARITY_THRESHOLD = 0.85
 
+# Module level and unindented, so the system prompt is byte-identical on
+# every call (and whatever the code around it) and the provider can serve
+# it from its prompt cache
+SYSTEM_PROMPT = """You are an assistant designed to generate technical home assignments for developer candidates based on three input sources:
 
-def generate_home_assignment(input_json: dict) -> dict:
+1. Jira Tasks JSON
+2. Prompt JSON (role, level, focus, difficulty, etc.)
+3. Template Repository JSON (structure, files)
+
+Generate a valid JSON homeAssignment with:
+- Title and description
+- List of required tasks
+- Technologies and tools to use
+- Evaluation criteria
+- Clear submission instructions
+
+Format the output as a valid JSON object only.
+"""
+
+
+def _build_messages(input_json: dict) -> list:
+    """System and user messages of the home assignment request"""
+    jira_tasks = input_json.get("jira_tasks", {})
+    prompt_data = input_json.get("prompt_data", {})
+    template_repo = input_json.get("template_repo", {})
+
+    # if not jira_tasks or not prompt_data or not template_repo:
+    #     raise ValueError("Missing one or more required fields: jira_tasks, prompt_data, template_repo")
+
+    # Minified, and trimmed of the Jira tasks and template files least
+    # relevant to the role when they don't fit the token budget
+    inputs = fit_to_budget(
+        {"jira_tasks": jira_tasks, "prompt_data": prompt_data, "template_repo": template_repo},
+        trimmable={"jira_tasks": ("tasks", "issues"), "template_repo": ("files", "structure")},
+        reference=prompt_data,
+    )
+
+    # Least to most variable: the template repository rarely changes between
+    # calls, the Jira tasks do, so the cached prefix reaches as far as possible
+    user_message = (
+        f"TEMPLATE REPOSITORY:\n{inputs['template_repo']}\n\n"
+        f"PROMPT:\n{inputs['prompt_data']}\n\n"
+        f"JIRA TASKS:\n{inputs['jira_tasks']}\n"
+    )
+
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_message}
+    ]
+
+
+def generate_home_assignment(input_json: dict, on_section: Callable[[str, object], None] = None) -> dict:
     """
     Generate a technical home assignment using Azure OpenAI based on unified JSON input.
 
@@ -27,52 +78,128 @@ def generate_home_assignment(input_json: dict) -> dict:
         "template_repo": { ... }
     }
 
+    Args:
+        input_json: The unified input above
+        on_section: Optional callback(name, value), called with every
+            top-level section of the assignment as soon as it is generated
+            (the completion is streamed then)
+
     Returns: dict (homeAssignment JSON)
     """
-    jira_tasks = input_json.get("jira_tasks", {})
-    prompt_data = input_json.get("prompt_data", {})
-    template_repo = input_json.get("template_repo", {})
+    if on_section is not None:
+        for event in stream_home_assignment(input_json):
+            if event["type"] == "section":
+                on_section(event["name"], event["value"])
+            elif event["type"] == "result":
+                return event["assignment"]
+
+    response = complete(
+        "task_generate",
+        model=deployment_name,
+        messages=_build_messages(input_json),
+        response_format={"type": "json_object"},
+        max_completion_tokens=4096,
+    )
 
-    # if not jira_tasks or not prompt_data or not template_repo:
-    #     raise ValueError("Missing one or more required fields: jira_tasks, prompt_data, template_repo")
+    try:
+        result = response.choices[0].message.content
+        return json.loads(result)
+    except json.JSONDecodeError:
+        raise ValueError("Failed to parse response as valid JSON.")
 
-    system_prompt = """
-    You are an assistant designed to generate technical home assignments for developer candidates based on three input sources:
 
-    1. Jira Tasks JSON
-    2. Prompt JSON (role, level, focus, difficulty, etc.)
-    3. Template Repository JSON (structure, files)
+def stream_home_assignment(input_json: dict) -> Iterator[dict]:
+    """
+    Generate a home assignment like generate_home_assignment, streaming the
+    completion and parsing the JSON while it arrives.
+
+    Yields events:
+        {"type": "token", "text": str}                      every received delta
+        {"type": "section", "name": str, "value": object}   a top-level section
+            (title, description, tasks, ...) as soon as it is complete
+        {"type": "result", "assignment": dict}              the whole validated
+            assignment, last
+
+    Raises:
+        ValueError: If the completion isn't a valid JSON object
+    """
+    parser = IncrementalJSONObjectParser()
+    started = time.monotonic()
+    first_section = None
+    for delta in stream(
+        "task_generate",
+        model=deployment_name,
+        messages=_build_messages(input_json),
+        response_format={"type": "json_object"},
+        max_completion_tokens=4096,
+    ):
+        yield {"type": "token", "text": delta}
+        for name, value in parser.feed(delta):
+            if first_section is None:
+                first_section = time.monotonic() - started
+                logger.info(f"First assignment section ({name}) after {first_section:.1f}s")
+            yield {"type": "section", "name": name, "value": value}
 
-    Generate a valid JSON homeAssignment with:
-    - Title and description
-    - List of required tasks
-    - Technologies and tools to use
-    - Evaluation criteria
-    - Clear submission instructions
+    try:
+        assignment = json.loads("".join(parser.text))
+    except json.JSONDecodeError:
+        raise ValueError("Failed to parse response as valid JSON.")
+    if not isinstance(assignment, dict):
+        raise ValueError("Failed to parse response as valid JSON.")
+    logger.info(f"Assignment generated in {time.monotonic() - started:.1f}s")
+    yield {"type": "result", "assignment": assignment}
 
-    Format the output as a valid JSON object only.
-    """
 
-    user_message = f"""
-    JIRA TASKS:\n{json.dumps(jira_tasks, indent=2)}
+def _variant_text(assignment: dict) -> str:
+    # What makes two assignments different; evaluation and submission
+    # boilerplate is alike in all of them
+    sections = [assignment.get(name) for name in ("title", "description", "tasks") if assignment.get(name)]
+    return json.dumps(sections or assignment, ensure_ascii=False)
 
-    PROMPT:\n{json.dumps(prompt_data, indent=2)}
 
-    TEMPLATE REPOSITORY:\n{json.dumps(template_repo, indent=2)}
+def generate_home_assignment_variants(input_json: dict, n: int = 3,
+                                      similarity_threshold: float = VARIANT_SIMILARITY_THRESHOLD) -> List[dict]:
     """
+    Generate up to n different home assignments for the same input in one
+    request: the n completions of a single call share one pass over the
+    prompt. Near-identical variants are dropped.
+
+    Args:
+        input_json: Same input as generate_home_assignment
+        n: Variants requested
+        similarity_threshold: Similarity above which a variant repeats an earlier one
 
-    response = client.chat.completions.create(
+    Returns:
+        List of distinct homeAssignment dicts (fewer than n if the model repeated itself)
+    """
+    response = complete(
+        "task_generate",
         model=deployment_name,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message}
-        ],
+        messages=_build_messages(input_json),
         response_format={"type": "json_object"},
         max_completion_tokens=4096,
+        n=n,
     )
 
-    try:
-        result = response.choices[0].message.content
-        return json.loads(result)
-    except json.JSONDecodeError:
-        raise ValueError("Failed to parse response as valid JSON.")
\ No newline at end of file
+    variants = []
+    kept_shingles = []
+    for choice in response.choices:
+        try:
+            assignment = json.loads(choice.message.content)
+        except (TypeError, json.JSONDecodeError):
+            logger.warning(f"Variant {choice.index} is not valid JSON, skipped")
+            continue
+        if not isinstance(assignment, dict):
+            continue
+        variant_shingles = shingles(_variant_text(assignment))
+        if any(len(variant_shingles & kept) / len(variant_shingles | kept) > similarity_threshold
+               for kept in kept_shingles):
+            logger.info(f"Variant {choice.index} repeats an earlier one, dropped")
+            continue
+        variants.append(assignment)
+        kept_shingles.append(variant_shingles)
+
+    if not variants:
+        raise ValueError("Failed to parse response as valid JSON.")
+    logger.info(f"Generated {len(variants)} distinct assignment variants of {n} requested")
+    return variants
@@ -1,3 +1,8 @@
+import os
+import sys
+
+# llm_gateway lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from mcpServer_taskGenerate import generate_home_assignment
 
 input_json = {
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Token budget for the JSON inputs embedded in LLM prompts.
+
+Inputs are minified, and when they still don't fit the budget the list
+items least relevant to a reference text (the role and requirements) are
+dropped first, e.g. Jira tasks and template repository files.
+
+Tokens are counted with tiktoken when it is installed, otherwise estimated
+at about 4 characters per token.
+"""
+
+import functools
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Tuple
+
+from utils import TECH_WORD_PATTERN
+
+logger = logging.getLogger("prompt_budget")
+
+# Tokens the embedded inputs may use together
+INPUT_TOKEN_BUDGET = int(os.getenv("PROMPT_INPUT_TOKEN_BUDGET", "8000"))
+
+# tiktoken encoding of the deployed GPT-4o / GPT-4.1 models
+TIKTOKEN_ENCODING = "o200k_base"
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TIKTOKEN_ENCODING)
+    except Exception as e:
+        # Not installed, or the encoding can't be downloaded
+        logger.info(f"tiktoken unavailable ({e}), estimating token counts")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Tokens of a text, exact with tiktoken, estimated otherwise"""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def minify(value: Any) -> str:
+    """JSON without indentation or spaces after separators"""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _words(value: Any) -> set:
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    return set(TECH_WORD_PATTERN.findall(text.lower()))
+
+
+def _trimmable_lists(value: Any, keys: Iterable[str]) -> List[list]:
+    """Lists held under one of the keys anywhere in the value (the value itself if it is a list)"""
+    if isinstance(value, list):
+        return [value]
+    found = []
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, child in node.items():
+                if key in keys and isinstance(child, list):
+                    found.append(child)
+                else:
+                    stack.append(child)
+        elif isinstance(node, list):
+            stack.extend(node)
+    return found
+
+
+def fit_to_budget(sections: Dict[str, Any], trimmable: Dict[str, Tuple[str, ...]],
+                  reference: Any = None, budget: int = INPUT_TOKEN_BUDGET) -> Dict[str, str]:
+    """
+    Minify the sections and trim them to the token budget.
+
+    Args:
+        sections: {name: JSON value} embedded in the prompt
+        trimmable: {name: keys} - items of the lists under these keys of the
+            section may be dropped; sections not listed are never trimmed
+        reference: Text or JSON the kept items should be relevant to, items
+            sharing the fewest words with it are dropped first
+        budget: Tokens the minified sections may use together
+
+    Returns:
+        {name: minified JSON}, in the order of sections
+    """
+    before = {name: count_tokens(json.dumps(value, indent=2)) for name, value in sections.items()}
+    # Copies, so trimming leaves the caller's data alone
+    sections = {name: json.loads(json.dumps(value)) for name, value in sections.items()}
+    texts = {name: minify(value) for name, value in sections.items()}
+    after = {name: count_tokens(text) for name, text in texts.items()}
+
+    if sum(after.values()) > budget:
+        reference_words = _words(reference or "")
+        scores = {}  # id(item) -> (relevance, tokens of the item and its separating comma)
+        dropped_count = 0
+        # Drop by the per-item costs, then filter the lists and count exactly.
+        # Summed item costs are approximate, another pass runs if still over
+        while sum(after.values()) > budget:
+            candidates = []
+            for name, keys in trimmable.items():
+                for items in _trimmable_lists(sections.get(name), keys):
+                    for index, item in enumerate(items):
+                        if id(item) not in scores:
+                            words = _words(item)
+                            scores[id(item)] = (len(words & reference_words) / (len(words) or 1),
+                                                count_tokens(minify(item)) + 1)
+                        candidates.append((scores[id(item)], name, items, index))
+            # Least relevant first, later items before earlier ones at equal relevance
+            candidates.reverse()
+            candidates.sort(key=lambda candidate: candidate[0][0])
+
+            total = sum(after.values())
+            remaining = {id(items): len(items) for _, _, items, _ in candidates}
+            dropped = {}  # id(list) -> (list, dropped indexes)
+            changed = set()
+            for (_, cost), name, items, index in candidates:
+                if total <= budget:
+                    break
+                # Keep at least one item of every list
+                if remaining[id(items)] <= 1:
+                    continue
+                remaining[id(items)] -= 1
+                dropped.setdefault(id(items), (items, set()))[1].add(index)
+                changed.add(name)
+                total -= cost
+            if not dropped:
+                break
+            for items, indexes in dropped.values():
+                items[:] = [item for index, item in enumerate(items) if index not in indexes]
+                dropped_count += len(indexes)
+            for name in changed:
+                texts[name] = minify(sections[name])
+                after[name] = count_tokens(texts[name])
+        if dropped_count:
+            logger.info(f"Dropped {dropped_count} least relevant input items to fit {budget} tokens")
+        if sum(after.values()) > budget:
+            logger.warning(f"Prompt inputs still use {sum(after.values())} tokens, over the {budget} token budget")
+
+    sizes = ", ".join(f"{name} {before[name]}->{after[name]}" for name in sections)
+    logger.info(f"Prompt input tokens: {sizes}, total {sum(before.values())}->{sum(after.values())} (budget {budget})")
+    return texts
@@ -1,30 +1,102 @@
-from flask import Flask,request,jsonify
+import json
+import queue
+import threading
+from flask import Flask,request,jsonify,Response,stream_with_context
 from flask_cors import CORS  # Import CORS
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-@app.route('/user-message', methods=['POST'])
-def user_message():
-    user_message = request.json.get('message')
+# Seconds between keep-alive comments while a stage is running, so proxies
+# don't close an idle stream
+HEARTBEAT_INTERVAL = 15
+
+
+def no_progress(event, data):
+    pass
+
+
+def process_message(user_message, emit=no_progress):
+    """
+    Run the workflow for a user message.
+
+    Args:
+        user_message: The message typed in the client
+        emit: Called as emit(event, data) while the workflow runs, e.g.
+            ("stage", {"stage": "topics", ...}), ("token", {"text": ...}),
+            ("section", {"name": ..., "value": ...})
+
+    Returns:
+        The response payload
+    """
     print(f"Received user message: {user_message}")
-    return jsonify({'message': "answer"})
+    emit("stage", {"stage": "received"})
+    return {'message': "answer"}
 
     # # Send user message to prompt manager (replace with your logic)
     # prompt_manager_answer = send_to_prompt_manager(user_message)
+    # emit("stage", {"stage": "prompt_manager"})
 
     # # Check if it's the final answer from prompt manager
     # if is_final_answer(prompt_manager_answer):
     #     # Send final answer to GitAgentManager and JiraAgentManager
     #     git_answer = send_to_git_agent_manager(prompt_manager_answer)
-    #     jira_answer = send_to_jira_agent_manager(prompt_manager_answer)
+    #     emit("stage", {"stage": "repository"})
+    #     jira_answer = send_to_jira_agent_manager(prompt_manager_answer, emit)
 
     #     # Send both answers as prompt to task generator
-    #     task_generator_answer = send_to_task_generator(git_answer, jira_answer)
+    #     task_generator_answer = send_to_task_generator(git_answer, jira_answer, emit)
 
-    #     return jsonify({'prompt_manager_answer': prompt_manager_answer, 'task_generator_answer': task_generator_answer})
+    #     return {'prompt_manager_answer': prompt_manager_answer, 'task_generator_answer': task_generator_answer}
     # else:
-    #     return jsonify({'prompt_manager_answer': prompt_manager_answer})
+    #     return {'prompt_manager_answer': prompt_manager_answer}
+
+
+@app.route('/user-message', methods=['POST'])
+def user_message():
+    user_message = request.json.get('message')
+    return jsonify(process_message(user_message))
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.route('/user-message/stream', methods=['POST'])
+def user_message_stream():
+    """
+    /user-message as Server-Sent Events: the workflow progress events as
+    they happen, then a "result" event with the same payload /user-message
+    returns (or an "error" event).
+    """
+    user_message = request.json.get('message')
+    events = queue.Queue()
+
+    def run():
+        try:
+            events.put(("result", process_message(user_message, lambda event, data: events.put((event, data)))))
+        except Exception as e:
+            events.put(("error", {"message": str(e)}))
+
+    threading.Thread(target=run, daemon=True).start()
+
+    def generate():
+        while True:
+            try:
+                event, data = events.get(timeout=HEARTBEAT_INTERVAL)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield sse_event(event, data)
+            if event in ("result", "error"):
+                return
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 
 def send_to_prompt_manager(message):
     # Implement logic to send message to prompt manager and receive answer
@@ -41,14 +113,18 @@ def send_to_git_agent_manager(answer):
     # Replace with actual implementation
     return "Git agent response"
 
-def send_to_jira_agent_manager(answer):
+def send_to_jira_agent_manager(answer, emit=no_progress):
     # Implement logic to send answer to JiraAgentManager and receive response
-    # Replace with actual implementation
+    # Replace with actual implementation, passing
+    # on_progress=lambda stage, data: emit("stage", dict(data, stage=stage))
+    # to jira_extractor_agent.main reports the topics extracted and issues found
     return "Jira agent response"
 
-def send_to_task_generator(git_answer, jira_answer):
+def send_to_task_generator(git_answer, jira_answer, emit=no_progress):
     # Implement logic to send answers to task generator and receive response
-    # Replace with actual implementation
+    # Replace with actual implementation, iterating
+    # mcpServer_taskGenerate.stream_home_assignment and emitting its token
+    # and section events streams the assignment while it is generated
     return "Task generator response"
 
 
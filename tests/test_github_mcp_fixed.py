@@ -0,0 +1,45 @@
+import asyncio
+import io
+import json
+import os
+import sys
+
+from mcp import StdioServerParameters
+
+from github_mcp_fixed import GitHubMCPClient, stream_operations
+
+FAKE_SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "benchmarks", "fake_github_mcp_server.py")
+
+
+async def _stream(operations):
+    client = GitHubMCPClient(server_params=StdioServerParameters(command=sys.executable, args=[FAKE_SERVER]))
+    assert await client.connect()
+    try:
+        out = io.StringIO()
+        failed = await stream_operations(client, operations, out)
+    finally:
+        await client.close()
+    return failed, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_ndjson_stream_with_fetch_tree(tmp_path):
+    failed, lines = asyncio.run(_stream([
+        ("list_issues", {"owner": "octocat", "repo": "hello-world"}),
+        ("fetch_tree", {"owner": "octocat", "repo": "hello-world", "path": "docs", "dest_dir": str(tmp_path)}),
+        ("fetch_tree", {"owner": "octocat", "repo": "hello-world", "path": "missing"}),
+    ]))
+
+    assert failed == 1
+    issues = [line for line in lines if line["index"] == 0]
+    assert issues and all("item" in line for line in issues)
+
+    # One line with the report for a successful fetch_tree
+    [fetched] = [line for line in lines if line["index"] == 1]
+    assert fetched["item"]["success"]
+    assert fetched["item"]["files"] == ["docs/architecture.md", "docs/setup.md"]
+    assert (tmp_path / "docs" / "setup.md").exists()
+
+    # A fetch_tree with errors is reported as a failed operation
+    [missing] = [line for line in lines if line["index"] == 2]
+    assert "error" in missing and missing["item"]["errors"]
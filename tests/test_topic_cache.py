@@ -0,0 +1,22 @@
+from jira_extractor.topic_cache import TopicSearchCache, normalize_topic
+
+
+def test_distinct_languages_get_distinct_keys():
+    topics = ["C++", "C#", "C", "node.js", "Node", "Java", "JavaScript"]
+    keys = [normalize_topic(topic) for topic in topics]
+    assert all(keys)
+    assert len(set(keys)) == len(topics)
+
+
+def test_spellings_of_one_topic_share_a_key():
+    assert normalize_topic("Databases") == normalize_topic("database")
+    assert normalize_topic("CI/CD") == normalize_topic("pipeline")
+    assert normalize_topic("Machine Learning") == normalize_topic("learning machine")
+
+
+def test_topics_without_words_are_not_cached():
+    assert normalize_topic("!!!") == ""
+    cache = TopicSearchCache()
+    cache.put("!!!", {"DEV-1": "Unrelated"})
+    assert cache.get("???") is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,15 @@
+from jira_extractor.topic_extractor import CONFIDENCE_THRESHOLD, extract_topics
+
+
+def test_languages_with_symbols_stay_distinct():
+    topics, confidence = extract_topics({"tasks_description": "C++, C#, C, node.js", "language": "Python"})
+    assert topics[:4] == ["c++", "c#", "c", "node.js"]
+    assert confidence >= CONFIDENCE_THRESHOLD
+
+
+def test_imperative_prose_goes_to_the_llm():
+    topics, confidence = extract_topics({
+        "tasks_description": "Build a REST API with Flask, deploy to Kubernetes, add monitoring."
+    })
+    assert not {"build", "deploy", "add"} & set(topics)
+    assert confidence < CONFIDENCE_THRESHOLD
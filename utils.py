@@ -2,6 +2,23 @@ import json
 import re
 import ast
 
+# Lowercase technical words, keeping "c++", "c#", "node.js" whole
+TECH_WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# Character shingle length
+SHINGLE_SIZE = 4
+
+def normalize_text(text):
+    """Lowercase words of a text joined by single spaces, punctuation dropped"""
+    return " ".join(re.findall(r"\w+", (text or "").lower()))
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Character shingles of the normalized text, compared by Jaccard similarity"""
+    text = normalize_text(text)
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
 def extract_json_from_response(response_text):
     """
     Extracts and parses JSON data from a response text.
@@ -56,4 +73,81 @@ def extract_json_from_response(response_text):
             raise ValueError(f"Failed to parse JSON after multiple attempts: {json_str[:50]}...")
 
     except Exception as e:
-        raise ValueError(f"Error processing JSON: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Error processing JSON: {str(e)}")
+
+
+class IncrementalJSONObjectParser:
+    """
+    Parses a JSON object while it is being received, e.g. from a streamed
+    LLM completion, and reports each top-level member as soon as its value
+    is complete.
+
+    Text before the opening brace (a ```json fence, a preamble) is ignored.
+
+    Usage:
+        parser = IncrementalJSONObjectParser()
+        for chunk in chunks:
+            for key, value in parser.feed(chunk):
+                ...
+    """
+
+    def __init__(self):
+        self.text = []          # everything fed so far
+        self._member = []       # raw text of the member being received
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.done = False
+
+    def feed(self, chunk: str) -> list:
+        """
+        Add received text.
+
+        Returns:
+            List of (key, value) for the top-level members completed by this chunk
+        """
+        self.text.append(chunk)
+        completed = []
+        for char in chunk:
+            if self.done:
+                break
+            if self._depth == 0:
+                # Still looking for the opening brace of the object
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete(completed)
+                    self.done = True
+                    break
+            elif char == "," and self._depth == 1:
+                self._complete(completed)
+                continue
+            self._member.append(char)
+        return completed
+
+    def _complete(self, completed: list):
+        member = "".join(self._member).strip()
+        self._member = []
+        if not member:
+            return
+        try:
+            parsed = json.loads("{" + member + "}")
+        except json.JSONDecodeError:
+            return
+        completed.extend(parsed.items())
+